@@ -0,0 +1,58 @@
+"""
+パッケージのインポート時間を計測し、pywin32・COMを読み込んでいないことを確認
+(インポート時間の回帰テスト、上限を超えた場合・pywin32を読み込んだ場合は終了コード1)
+
+実行方法:
+    py -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+
+# 計測するインポート文
+TARGETS = ("import ceviopy", "import ceviopy.cevio", "from ceviopy import Cevio")
+
+# インポート時に読み込んではいけないモジュール
+FORBIDDEN = ("win32com", "pythoncom", "pywintypes", "asyncio")
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+loaded = [name for name in {forbidden!r} if name in sys.modules]
+print(seconds, ",".join(loaded))
+"""
+
+def measure(statement:str, repeat:int=10):
+    """
+    新しいプロセスでインポートを実行し、最短時間(秒)と読み込まれた禁止モジュールを返す
+    """
+    best = None
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _SCRIPT.format(statement=statement, forbidden=FORBIDDEN)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        seconds = float(output[0])
+        best = seconds if best is None else min(best, seconds)
+        if (len(output) > 1):
+            loaded.update(output[1].split(","))
+    return best, sorted(loaded)
+
+def main(limit:float=0.15, repeat:int=10) -> int:
+    failed = False
+    for statement in TARGETS:
+        seconds, loaded = measure(statement, repeat)
+        status = "ok"
+        if (loaded):
+            status = f"NG (loaded: {', '.join(loaded)})"
+            failed = True
+        elif (seconds > limit):
+            status = f"NG (over {limit * 1000:.0f} ms)"
+            failed = True
+        print(f"{statement}: {seconds * 1000:.1f} ms {status}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+render_batch の出力速度(行/秒)とワーカー数によるスケーリングを計測
+
+実行方法:
+    py -m benchmarks.bench_render_batch
+"""
+import shutil
+import tempfile
+from ceviopy.cevio import Cevio
+from ceviopy.simulator import Simulator
+
+def main(lines:int=400, workers=(1, 2, 4, 8)):
+    sim = Simulator(synthesis_rate=0.0005)
+    cevio = Cevio("AI", backend=sim, player=sim.play)
+    casts = list(sim.casts)
+    items = [
+        {
+            "text": f"{i}番目のセリフです。いらっしゃいませ、本日はご来店ありがとうございます。",
+            "Cast": casts[i % len(casts)],
+            "talk": {"Speed": 40 + i % 3 * 10}
+        }
+        for i in range(lines)
+    ]
+    baseline = None
+    for n in workers:
+        out_dir = tempfile.mkdtemp(prefix="ceviopy-bench-")
+        try:
+            result = cevio.render_batch(items, out_dir, workers=n)
+        finally:
+            shutil.rmtree(out_dir)
+        baseline = baseline or result["lines_per_second"]
+        print(f"workers={n}: {result['lines_per_second']:.1f} lines/s (x{result['lines_per_second'] / baseline:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+テキスト分割(segment)の処理速度(文字/秒)を計測
+
+実行方法:
+    py -m benchmarks.bench_text
+"""
+import re
+import time
+from ceviopy.text import segment
+
+SAMPLE = (
+    "CeVIO AIでは200文字、Creative Studioでは100文字以上のテキストを再生する場合、テキストを分割する必要があります。"
+    "このモジュールでは最大文字数に一番近い部分の文章の「、」や「。」などが入るところで、文章を区切るよう設計しています。\n"
+    "区切り文字のないとても長い文章" + "あ" * 250 + "\n"
+)
+
+def legacy_split(text, nums):
+    # 旧実装(比較用)
+    text = re.sub(r"([、|。|，|．|,|.|・|\r\n|\n|\t| |　])", r"\1<SPLITED_TEXT>", text)
+    splited_text = re.split("<SPLITED_TEXT>", text)
+    return_text = [""]
+    for t in splited_text:
+        if len(return_text[len(return_text)-1]+t) <= nums:
+            return_text[len(return_text)-1] += t
+        else:
+            return_text.append(t)
+    return return_text
+
+def measure(func, text, limit):
+    start = time.perf_counter()
+    chunks = 0
+    for _ in func(text, limit):
+        chunks += 1
+    seconds = time.perf_counter() - start
+    return len(text) / seconds, chunks
+
+def main(megabytes:int=4):
+    # UTF-8で約megabytes MBの日本語テキスト
+    text = SAMPLE * (megabytes * 1024 * 1024 // len(SAMPLE.encode("utf-8")))
+    print(f"text: {len(text)} chars ({len(text.encode('utf-8')) / 1024 / 1024:.1f} MB)")
+    for limit in (200, 100):
+        speed, chunks = measure(segment, text, limit)
+        print(f"segment      limit={limit}: {speed / 1e6:.2f} M chars/s ({chunks} chunks)")
+        speed, chunks = measure(legacy_split, text, limit)
+        print(f"legacy split limit={limit}: {speed / 1e6:.2f} M chars/s ({chunks} chunks)")
+
+if __name__ == "__main__":
+    main()
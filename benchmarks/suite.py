@@ -0,0 +1,276 @@
+"""
+speak・パラメータ設定の主要処理をまとめて計測するベンチマーク
+CeVIOの代わりにSimulatorを使うため、CeVIOがない環境(Linux等)でも実行できる
+結果はJSONで出力し、--compareで以前の結果と比較する
+
+計測項目:
+    segment.*         テキスト分割の処理速度(文字/秒)
+    round_trips.*     操作ごとのCOM呼び出し回数
+    switch.*          パラメータ切り替えにかかる時間(秒、中央値)
+    ttfa.*            speak開始から最初の音声が出るまでの時間(秒、中央値)
+    import.*          インポート時間(秒)
+    startup.*         Cevio生成(起動確認・キャスト一覧取得)にかかる時間(秒、中央値)
+
+実行方法:
+    py -m benchmarks.suite --output result.json
+    py -m benchmarks.suite --compare result.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from ceviopy.cevio import Cevio
+from ceviopy.simulator import Simulator
+from ceviopy.text import segment
+from benchmarks.bench_import import measure as measure_import
+from benchmarks.bench_text import SAMPLE
+
+# COM呼び出し1回あたりの時間(プロセス外COMの目安)
+CALL_LATENCY = 0.0003
+
+# 再生時間が計測を支配しないよう、読み上げ速度は実機より速くする
+SIM_OPTIONS = {"synthesis_rate": 0.001, "chars_per_second": 2000.0}
+
+# 比較時に誤差とみなす差(単位: 値)
+NOISE = {"s": 0.001}
+
+TEXT = "本日はご来店いただき、誠にありがとうございます。ただいまタイムセールを実施しております。" * 6
+
+class _ProbeSimulator(Simulator):
+    """
+    最初の音声が出た時刻を記録するSimulator
+    Speakの場合は音声合成が終わった時刻、playの場合は呼び出された時刻
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.first_audio = None
+        self._speaking = False
+
+    def call(self, member:str) -> None:
+        super().call(member)
+        self._speaking = member == "Talker.Speak"
+
+    def synthesis_time(self, text:str) -> float:
+        seconds = super().synthesis_time(text)
+        if (self._speaking and self.first_audio is None):
+            self.first_audio = time.perf_counter() + seconds
+        return seconds
+
+    def play(self, wave:bytes) -> None:
+        if (self.first_audio is None):
+            self.first_audio = time.perf_counter()
+        super().play(wave)
+
+def _quiet():
+    # Cevioの表示(パラメータ変更・再生テキスト)を抑止
+    return contextlib.redirect_stdout(io.StringIO())
+
+def _median(func, repeat:int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def _metric(value, unit:str, better:str) -> dict:
+    return {"value": value, "unit": unit, "better": better}
+
+def bench_segment(megabytes:int=1, repeat:int=3) -> dict:
+    text = SAMPLE * (megabytes * 1024 * 1024 // len(SAMPLE.encode("utf-8")))
+    result = {}
+    for limit in (200, 100):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in segment(text, limit):
+                pass
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        result[f"segment.limit{limit}"] = _metric(len(text) / best, "chars/s", "higher")
+    return result
+
+def bench_round_trips(config:str) -> dict:
+    sim = Simulator(**SIM_OPTIONS)
+    with _quiet():
+        cevio = Cevio("AI", backend=sim)
+        casts = cevio.get_available_cast()
+        operations = {
+            "startup": None,
+            "load_state": lambda: (cevio.invalidate(), cevio.get_talk_params()),
+            "get_talk_params": lambda: cevio.get_talk_params(),
+            "set_talk_params": lambda: cevio.set_talk_params({"Speed": 60, "Volume": 40}),
+            "set_cast_params": lambda: cevio.set_cast_params({"元気": 30}),
+            "set_cast": lambda: cevio.set_cast(casts[1]),
+            "apply": lambda: cevio.apply(cast=casts[0], talk={"Tone": 55}, emotion={"元気": 70}),
+            "read_json": lambda: cevio.read_json(config),
+            "speak": lambda: cevio.speak("こんにちは。"),
+        }
+        result = {"round_trips.startup": _metric(sum(sim.calls.values()), "calls", "lower")}
+        for name, func in operations.items():
+            if (func is None):
+                continue
+            sim.reset_calls()
+            func()
+            result[f"round_trips.{name}"] = _metric(sum(sim.calls.values()), "calls", "lower")
+        cevio.close()
+    return result
+
+def bench_switch(config:str, repeat:int=20) -> dict:
+    sim = Simulator(call_latency=CALL_LATENCY, **SIM_OPTIONS)
+    with _quiet():
+        cevio = Cevio("AI", backend=sim)
+        casts = cevio.get_available_cast()
+        presets = [
+            {"cast": casts[0], "talk": {"Speed": 60, "Tone": 45}, "emotion": {"元気": 80}},
+            {"cast": casts[0], "talk": {"Speed": 40, "Tone": 55}, "emotion": {"元気": 20}},
+        ]
+        cast_presets = [{"cast": casts[0]}, {"cast": casts[1]}]
+        toggle = {"emotion": 0, "cast": 0}
+
+        def switch_emotion():
+            toggle["emotion"] ^= 1
+            cevio.apply(**presets[toggle["emotion"]])
+
+        def switch_cast():
+            toggle["cast"] ^= 1
+            cevio.apply(**cast_presets[toggle["cast"]])
+
+        def switch_json():
+            # read_jsonは設定ファイルとの差分がなくても全項目を設定する
+            cevio.set_cast(casts[1])
+            cevio.read_json(config)
+
+        result = {
+            "switch.apply_params": _metric(_median(switch_emotion, repeat), "s", "lower"),
+            "switch.apply_cast": _metric(_median(switch_cast, repeat), "s", "lower"),
+            "switch.read_json": _metric(_median(switch_json, repeat), "s", "lower"),
+        }
+        cevio.close()
+    return result
+
+def bench_ttfa(repeat:int=5) -> dict:
+    # いずれも_ProbeSimulatorで、音声合成を含めて最初の音声が出た時刻を計測する
+    fragments = lambda: (TEXT[i:i + 8] for i in range(0, len(TEXT), 8))
+    cases = (
+        ("speak", 0, lambda cevio: cevio.speak(TEXT, pipeline_depth=0)),
+        ("speak_pipelined", 2, lambda cevio: cevio.speak(TEXT, pipeline_depth=2)),
+        ("speak_stream", 0, lambda cevio: cevio.speak_stream(fragments())),
+    )
+    result = {}
+    for name, depth, speak in cases:
+        samples = []
+        for _ in range(repeat):
+            sim = _ProbeSimulator(call_latency=CALL_LATENCY, **SIM_OPTIONS)
+            with _quiet():
+                cevio = Cevio("AI", backend=sim, player=sim.play if depth else None)
+                start = time.perf_counter()
+                speak(cevio)
+                cevio.close()
+            samples.append(sim.first_audio - start)
+        result[f"ttfa.{name}"] = _metric(statistics.median(samples), "s", "lower")
+    return result
+
+def bench_startup(repeat:int=5) -> dict:
+    result = {}
+    for statement in ("import ceviopy", "import ceviopy.cevio"):
+        seconds, _ = measure_import(statement, repeat)
+        result[f"import.{statement.split()[-1]}"] = _metric(seconds, "s", "lower")
+
+    def start():
+        sim = Simulator(call_latency=CALL_LATENCY, **SIM_OPTIONS)
+        with _quiet():
+            Cevio("AI", backend=sim).close()
+
+    result["startup.cevio"] = _metric(_median(start, repeat), "s", "lower")
+    return result
+
+def run() -> dict:
+    """
+    すべての項目を計測
+
+    Returns:
+        result (dict): 'meta' 実行環境, 'metrics' {項目名: {'value', 'unit', 'better'}}
+    """
+    metrics = {}
+    with tempfile.TemporaryDirectory(prefix="ceviopy-bench-") as work:
+        config = os.path.join(work, "config.json")
+        with open(config, "w", encoding="utf-8") as f:
+            json.dump({
+                "talk": {"Volume": 50, "Speed": 50, "Tone": 50, "ToneScale": 50, "Alpha": 50},
+                "Cast": "さとうささら",
+                "Emotion": {"普通": 100, "元気": 0, "怒り": 0, "哀しみ": 0}
+            }, f, ensure_ascii=False)
+        for bench in (bench_segment, lambda: bench_round_trips(config), lambda: bench_switch(config), bench_ttfa, bench_startup):
+            metrics.update(bench())
+    return {"meta": _meta(), "metrics": metrics}
+
+def compare(result:dict, baseline:dict, threshold:float=0.2) -> list:
+    """
+    以前の結果との比較
+
+    Args:
+        result (dict): 今回の結果
+        baseline (dict): 以前の結果
+        threshold (float): 悪化とみなす変化率
+
+    Returns:
+        regressions (list): 悪化した項目名
+    """
+    regressions = []
+    for name, metric in result["metrics"].items():
+        old = baseline["metrics"].get(name)
+        if (old is None or not old["value"]):
+            continue
+        ratio = metric["value"] / old["value"]
+        worse = ratio < 1 - threshold if metric["better"] == "higher" else ratio > 1 + threshold
+        if (abs(metric["value"] - old["value"]) <= NOISE.get(metric["unit"], 0)):
+            worse = False
+        if (worse):
+            regressions.append(name)
+        print(f"{name}: {old['value']:.6g} -> {metric['value']:.6g} {metric['unit']} (x{ratio:.2f}){' NG' if worse else ''}")
+    return regressions
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "call_latency": CALL_LATENCY
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ceviopy benchmark suite")
+    parser.add_argument("--output", help="結果を保存するJSONファイル(省略時は標準出力)")
+    parser.add_argument("--compare", help="比較する以前の結果(JSONファイル)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="悪化とみなす変化率")
+    args = parser.parse_args()
+
+    result = run()
+    if (args.output):
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if (args.compare):
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        return 1 if compare(result, baseline, args.threshold) else 0
+    if not (args.output):
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
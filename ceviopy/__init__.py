@@ -0,0 +1,35 @@
+"""
+CeVIOPy
+Python上でCeVIO AI / CeVIO Creative Studioのトーク機能を利用するモジュール群
+
+各クラスは初めて参照した時に読み込む(インポート時にpywin32・COMは読み込まない)
+"""
+
+# 公開クラス: 定義しているモジュール
+_exports = {
+    "Cevio": "cevio",
+    "CevioException": "cevio",
+    "AsyncCevio": "aio",
+    "AudioCache": "cache",
+    "Backend": "backend",
+    "ComBackend": "backend",
+    "AudioStore": "store",
+    "CastCatalog": "catalog",
+    "ChatReader": "admission",
+    "CevioRouter": "router",
+    "Profile": "profile",
+    "SpeechScheduler": "scheduler",
+    "Simulator": "simulator",
+    "TalkerPool": "pool",
+    "TraceReplayer": "trace",
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,237 @@
+import collections
+import threading
+import time
+from .audio import speed_rate
+from .text import segment
+
+class ChatItem:
+    """
+    読み上げ待ちのメッセージ
+    """
+
+    def __init__(self, user, text:str, arrival:float, duration:float, deadline:float) -> None:
+        self.user = user
+        self.text = text
+        self.arrival = arrival
+        self.duration = duration
+        self.deadline = deadline
+
+class ChatReader:
+    """
+    チャット読み上げの流量制御
+    メッセージの読み上げ時間を文字数と速さ(Speed)から見積もり、受信から読み上げ終了までの遅れをmax_lag秒以内に抑える
+    遅れが上限を超える場合は、設定に応じて切り詰め・破棄・結合を行う
+
+    Examples:
+        reader = ChatReader(max_lag=10.0, fair=True, per_user="merge")
+        # 受信側(任意のスレッド)
+        reader.offer("こんにちは", user="viewer1")
+        # 読み上げ側(Cevioを生成したスレッド)
+        reader.run(cevio)
+    """
+
+    def __init__(self, max_lag:float=15.0, latest_wins:bool=True, fair:bool=True, per_user:str=None,
+                 truncate:bool=True, min_chars:int=10, chars_per_second:float=8.0, speed:int=50) -> None:
+        """
+        Args:
+            max_lag (float): 受信から読み上げ終了までの遅れの上限(秒)
+            latest_wins (bool): 上限を超える場合、True:古いメッセージから破棄 False:新しいメッセージを破棄
+            fair (bool): ユーザーごとに順番に読み上げる(Falseの場合は受信順)
+            per_user (str): ユーザーごとの待機中メッセージの扱い
+                            None:そのまま "latest":最新のもののみ残す "merge":1つに結合する
+            truncate (bool): 上限に収まらないメッセージを、収まる長さに切り詰める
+            min_chars (int): 切り詰める場合の最小文字数(これより短くなる場合は切り詰めずに破棄)
+            chars_per_second (float): Speed=50のときの1秒あたりの読み上げ文字数
+            speed (int): 見積もりに使う速さ(run()では読み上げ前にCevioの値で更新)
+        """
+        if per_user not in (None, "latest", "merge"):
+            raise ValueError("per_user must be None, 'latest' or 'merge'.")
+        self.max_lag = max_lag
+        self.latest_wins = latest_wins
+        self.fair = fair
+        self.per_user = per_user
+        self.truncate = truncate
+        self.min_chars = min_chars
+        self.chars_per_second = chars_per_second
+        self.speed = speed
+        self._queues = collections.OrderedDict()
+        self._cond = threading.Condition()
+        self._speaking_until = 0.0
+        self._closed = False
+        self._counts = collections.Counter()
+        self._lags = collections.deque(maxlen=1000)
+
+    def estimate(self, text:str) -> float:
+        """
+        読み上げ時間の見積もり(秒)、Speed=0で0.5倍速、Speed=100で2倍速
+        """
+        return len(text) / (self.chars_per_second * speed_rate(self.speed))
+
+    def offer(self, text:str, user=None) -> bool:
+        """
+        メッセージの受信
+
+        Args:
+            text (str): メッセージ
+            user: 送信者(fair, per_userの単位)
+
+        Returns:
+            result (bool): 読み上げ待ちに追加した場合True、破棄した場合False
+        """
+        now = time.monotonic()
+        with self._cond:
+            if (self._closed):
+                return False
+            self._counts["offered"] += 1
+            key = user if self.fair else None
+            queue = self._queues.get(key, ())
+            own = [item for item in queue if item.user == user]
+            if (own and self.per_user == "latest"):
+                for item in own:
+                    queue.remove(item)
+                self._counts["admitted"] -= len(own)
+                self._counts["replaced"] += len(own)
+            elif (own and self.per_user == "merge"):
+                # 最初のメッセージの受信時刻・期限を引き継いで結合
+                item = own[-1]
+                queue.remove(item)
+                text = f"{item.text}\n{text}"
+                now = item.arrival
+                self._counts["admitted"] -= 1
+                self._counts["merged"] += 1
+            if (key in self._queues and not self._queues[key]):
+                del self._queues[key]
+
+            duration = self.estimate(text)
+            budget = self._budget(now)
+            if (duration > budget and self.latest_wins):
+                # 古いメッセージから破棄して空きを作る
+                while duration > budget and self._drop_oldest():
+                    budget = self._budget(now)
+            if (duration > budget and self.truncate):
+                text = self._truncate(text, budget)
+                if (text is not None):
+                    duration = self.estimate(text)
+                    self._counts["truncated"] += 1
+            if (text is None or duration > budget):
+                self._counts["dropped"] += 1
+                return False
+            self._queues.setdefault(key, collections.deque()).append(ChatItem(user, text, now, duration, now + self.max_lag))
+            self._counts["admitted"] += 1
+            self._cond.notify_all()
+            return True
+
+    def next(self, timeout:float=None):
+        """
+        次に読み上げるメッセージ(期限切れのものは破棄)
+
+        Args:
+            timeout (float): 待機する秒数(Noneの場合はメッセージが届くまで待つ)
+
+        Returns:
+            item (ChatItem | None): メッセージ、タイムアウトもしくは終了した場合None
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                while self._queues:
+                    key, queue = next(iter(self._queues.items()))
+                    item = queue.popleft()
+                    if (queue):
+                        # 次は別のユーザー
+                        self._queues.move_to_end(key)
+                    else:
+                        del self._queues[key]
+                    now = time.monotonic()
+                    if (now + item.duration > item.deadline):
+                        remain = self._truncate(item.text, item.deadline - now) if self.truncate else None
+                        if (remain is None):
+                            self._counts["expired"] += 1
+                            continue
+                        item.text = remain
+                        item.duration = self.estimate(remain)
+                        self._counts["truncated"] += 1
+                    self._speaking_until = now + item.duration
+                    self._lags.append(now + item.duration - item.arrival)
+                    return item
+                if (self._closed):
+                    return None
+                wait = None if end is None else end - time.monotonic()
+                if (wait is not None and wait <= 0):
+                    return None
+                self._cond.wait(wait)
+
+    def run(self, cevio) -> None:
+        """
+        close()が呼ばれるまで、メッセージを順に読み上げる(Cevioを生成したスレッドで呼び出す)
+
+        Args:
+            cevio (Cevio): 読み上げに使うCevio
+        """
+        while True:
+            self.speed = cevio.get_talk_params()["Speed"]
+            item = self.next()
+            if (item is None):
+                return
+            cevio.speak(item.text)
+            with self._cond:
+                self._speaking_until = 0.0
+                self._counts["spoken"] += 1
+
+    def close(self) -> None:
+        """
+        読み上げ待ちのメッセージを破棄して終了
+        """
+        with self._cond:
+            self._closed = True
+            self._queues.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """
+        統計
+
+        Returns:
+            stats (dict): 'offered' 受信, 'admitted' 追加, 'dropped' 破棄, 'expired' 期限切れ, 'truncated' 切り詰め,
+                          'merged' 結合, 'replaced' 置き換え, 'spoken' 読み上げ 件数, 'backlog' 待機中の読み上げ時間(秒),
+                          'max_lag' 受信から読み上げ終了見込みまでの最大秒数
+                          受信したメッセージは追加・破棄・結合・置き換えのいずれか1つに数える
+                          (追加後に破棄・結合・置き換えたものは、追加から除く)
+        """
+        with self._cond:
+            result = {key: self._counts[key] for key in ("offered", "admitted", "dropped", "expired", "truncated", "merged", "replaced", "spoken")}
+            result["backlog"] = self._backlog(time.monotonic())
+            result["max_lag"] = max(self._lags) if self._lags else None
+            return result
+
+    def _budget(self, arrival:float) -> float:
+        # 受信時刻arrivalのメッセージに残っている読み上げ時間
+        now = time.monotonic()
+        return self.max_lag - self._backlog(now) - (now - arrival)
+
+    def _backlog(self, now:float) -> float:
+        # 待機中のメッセージと再生中の残りの読み上げ時間
+        return max(self._speaking_until - now, 0.0) + sum(item.duration for queue in self._queues.values() for item in queue)
+
+    def _drop_oldest(self) -> bool:
+        oldest = None
+        for key, queue in self._queues.items():
+            if (queue and (oldest is None or queue[0].arrival < oldest[1][0].arrival)):
+                oldest = (key, queue)
+        if (oldest is None):
+            return False
+        key, queue = oldest
+        queue.popleft()
+        if not (queue):
+            del self._queues[key]
+        # 追加済みのメッセージを破棄に振り替える
+        self._counts["admitted"] -= 1
+        self._counts["dropped"] += 1
+        return True
+
+    def _truncate(self, text:str, seconds:float):
+        # 見積もりがseconds秒に収まるよう先頭から切り詰める(区切り文字があればそこで区切る)
+        chars = int(seconds * self.chars_per_second * speed_rate(self.speed))
+        if (chars < self.min_chars):
+            return None
+        return next(segment(text, chars), None)
@@ -0,0 +1,128 @@
+import asyncio
+import queue
+from .apartment import ComThread
+from .cevio import Cevio
+
+class AsyncCevio:
+    """
+    CeVIO 外部連携API(asyncio版)
+    COMオブジェクトは専用スレッドで保持し、各処理の完了をイベントループに通知する
+    再生中もイベントループは止まらない(処理は専用スレッドで順に実行)
+
+    Examples:
+        async with AsyncCevio("AI") as talk:
+            await talk.apply(emotion={"元気": 80})
+            await talk.speak("いらっしゃいませ")
+    """
+
+    def __init__(self, mode:str="AI", **kwargs) -> None:
+        """
+        CeVIO 起動(専用スレッドでCevioを生成)
+
+        Args:
+            mode (str): "AI" または "CCS"
+            **kwargs: Cevioの引数
+        """
+        self._thread = ComThread(kwargs.get("backend"), name=f"ceviopy-{mode}")
+        self._started = self._thread.submit(self._create, mode, kwargs)
+        self._cevio = None
+
+    def _create(self, mode, kwargs):
+        self._cevio = Cevio(mode, **kwargs)
+        return self._cevio
+
+    async def _call(self, name, *args, **kwargs):
+        # 専用スレッドでCevioのメソッドを実行し、完了を待つ
+        await asyncio.wrap_future(self._started)
+        return await asyncio.wrap_future(self._thread.submit(lambda: getattr(self._cevio, name)(*args, **kwargs)))
+
+    async def start(self) -> None:
+        """
+        CeVIOの起動完了を待つ
+
+        Raises :
+          CevioException : CeVIOが起動できない場合の例外
+        """
+        await asyncio.wrap_future(self._started)
+
+    async def speak(self, text:str, **kwargs) -> None:
+        """
+        セリフの再生(Cevio.speak)
+        """
+        await self._call("speak", text, **kwargs)
+
+    async def speak_stream(self, fragments) -> dict:
+        """
+        少しずつ届くテキストを順次再生(Cevio.speak_stream)
+
+        Args:
+            fragments (Iterable[str] | AsyncIterable[str]): テキストの断片
+        """
+        if not (hasattr(fragments, "__aiter__")):
+            return await self._call("speak_stream", fragments)
+        # イベントループで受け取った断片を専用スレッドへ渡す
+        received = queue.Queue()
+        done = object()
+        speaking = asyncio.ensure_future(self._call("speak_stream", iter(received.get, done)))
+        try:
+            async for fragment in fragments:
+                received.put(fragment)
+        except asyncio.CancelledError:
+            received.put(done)
+            speaking.cancel()
+            raise
+        except BaseException:
+            # 受け取り済みの断片を再生し終えてから、断片の受け取りで発生した例外を送出(再生側の例外は破棄)
+            received.put(done)
+            await asyncio.gather(speaking, return_exceptions=True)
+            raise
+        received.put(done)
+        return await speaking
+
+    async def apply(self, cast:str=None, talk:dict=None, emotion:dict=None) -> dict:
+        """
+        キャスト・コンディション・感情パラメータの一括設定(Cevio.apply)
+        """
+        return await self._call("apply", cast=cast, talk=talk, emotion=emotion)
+
+    async def set_cast(self, name:str) -> None:
+        await self._call("set_cast", name)
+
+    async def get_cast(self) -> str:
+        return await self._call("get_cast")
+
+    async def get_available_cast(self) -> list:
+        return await self._call("get_available_cast")
+
+    async def get_talk_params(self) -> dict:
+        return await self._call("get_talk_params")
+
+    async def get_cast_params(self) -> dict:
+        return await self._call("get_cast_params")
+
+    async def read_dict(self, params:dict) -> None:
+        await self._call("read_dict", params)
+
+    async def read_json(self, filepath:str) -> None:
+        await self._call("read_json", filepath)
+
+    async def render_batch(self, items:list, out_dir:str, workers:int=1) -> dict:
+        """
+        WAVファイル一括出力(Cevio.render_batch)
+        """
+        return await self._call("render_batch", items, out_dir, workers=workers)
+
+    async def close(self) -> None:
+        """
+        実行待ちの処理を終えた後、専用スレッドを終了
+        """
+        if (self._cevio is not None):
+            await self._call("close")
+        self._thread.close(wait=False)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+import queue
+import threading
+
+@contextmanager
+def com_apartment(backend=None):
+    """
+    スレッドのCOMアパートメント(STA)を用意するコンテキストマネージャー
+    Backendの場合はBackend.apartment()、win32com以外のbackend(シミュレーター等)の場合は何もしない
+
+    Args:
+        backend: COMオブジェクト生成元(Noneの場合はwin32com.client)
+    """
+    if hasattr(backend, "apartment"):
+        with backend.apartment():
+            yield
+        return
+    if backend is not None and getattr(backend, "__name__", "") != "win32com.client":
+        yield
+        return
+    import pythoncom
+    pythoncom.CoInitialize()
+    try:
+        yield
+    finally:
+        pythoncom.CoUninitialize()
+
+class ComThread:
+    """
+    COMオブジェクト専用スレッド
+    渡された処理をすべて同じスレッド(STA)で順に実行し、結果をFutureで返す
+    """
+
+    def __init__(self, backend=None, name:str="ceviopy-com") -> None:
+        """
+        Args:
+            backend: COMオブジェクト生成元(Noneの場合はwin32com.client)
+            name (str): スレッド名
+        """
+        self._backend = backend
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        with com_apartment(self._backend):
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                future, func, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        処理をCOMスレッドで実行
+
+        Returns:
+            future (concurrent.futures.Future): 処理結果
+        """
+        from concurrent.futures import Future
+        future = Future()
+        self._jobs.put((future, func, args, kwargs))
+        return future
+
+    def close(self, wait:bool=True) -> None:
+        """
+        実行待ちの処理を終えた後、スレッドを終了
+        """
+        self._jobs.put(None)
+        if wait and threading.current_thread() is not self._thread:
+            self._thread.join()
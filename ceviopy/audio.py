@@ -0,0 +1,52 @@
+import io
+import wave
+
+def join_waves(waves:list, gap:float=0.0) -> bytes:
+    """
+    複数のWAV(bytes)を1つに結合
+
+    Args:
+        waves (list): WAV(bytes)の一覧(フォーマットはすべて同一であること)
+        gap (float | list): 各WAVの間に挟む無音の長さ(秒)、listの場合は間ごとの長さ(len(waves) - 1個)
+
+    Returns:
+        result (bytes): 結合したWAV
+    """
+    if not waves:
+        raise ValueError("No wave to join.")
+    gaps = list(gap) if isinstance(gap, (list, tuple)) else [gap] * (len(waves) - 1)
+    if len(gaps) != len(waves) - 1:
+        raise ValueError("Number of gaps must be one less than number of waves.")
+    if len(waves) == 1:
+        return waves[0]
+    params = None
+    frames = []
+    for i, data in enumerate(waves):
+        with wave.open(io.BytesIO(data), "rb") as w:
+            if params is None:
+                params = w.getparams()
+            elif w.getparams()[:3] != params[:3]:
+                raise ValueError("Wave formats do not match.")
+            if i > 0 and gaps[i - 1] > 0:
+                frames.append(bytes(int(gaps[i - 1] * params.framerate) * params.sampwidth * params.nchannels))
+            frames.append(w.readframes(w.getnframes()))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(params.nchannels)
+        w.setsampwidth(params.sampwidth)
+        w.setframerate(params.framerate)
+        w.writeframes(b"".join(frames))
+    return buffer.getvalue()
+
+def speed_rate(speed:int) -> float:
+    """
+    コンディションSpeedに対する読み上げ速度の倍率、Speed=0で0.5倍速、Speed=50で等速、Speed=100で2倍速
+    """
+    return 2 ** ((speed - 50) / 50)
+
+def wave_duration(data:bytes) -> float:
+    """
+    WAV(bytes)の再生時間(秒)
+    """
+    with wave.open(io.BytesIO(data), "rb") as w:
+        return w.getnframes() / w.getframerate()
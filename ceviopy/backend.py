@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+
+# Cevioが利用するTalkerのメンバー
+TALKER_MEMBERS = (
+    "Cast", "AvailableCasts", "Volume", "Speed", "Tone", "ToneScale", "Alpha",
+    "Components", "Speak", "Stop", "OutputWaveToFile", "GetTextDuration"
+)
+
+# Cevioが利用するServiceControlのメンバー
+CONTROL_MEMBERS = ("IsHostStarted", "StartHost", "CloseHost")
+
+# Speakの戻り値(SpeakingState)のメンバー
+STATE_MEMBERS = ("IsCompleted", "IsSucceeded", "Wait", "Wait_2")
+
+class Backend:
+    """
+    CeVIOとの接続方法(バックエンド)の基底クラス
+    Cevio(backend=...)に渡すオブジェクトは、このクラスのメソッドを実装する
+
+    Dispatchが返すオブジェクトは、CeVIOのCOMオブジェクトと同じメンバーを持つ
+        Talker : TALKER_MEMBERS
+        ServiceControl : CONTROL_MEMBERS
+        SpeakingState : STATE_MEMBERS
+    Components は Length, At(index), ByName(name) を持ち、各要素は Name, Value を持つ
+    AvailableCasts は Length, At(index) を持つ
+    """
+
+    def Dispatch(self, progid:str):
+        """
+        COMオブジェクトの生成(win32com.client.Dispatch 互換)
+
+        Args:
+            progid (str): COMコンポーネント名
+
+        Returns:
+            Talker | ServiceControl : COMオブジェクト
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def apartment(self):
+        """
+        スレッドでCOMオブジェクトを利用する準備をするコンテキストマネージャー(既定は何もしない)
+        """
+        yield
+
+    def play(self, wave:bytes) -> None:
+        """
+        WAV(bytes)を再生(再生終了までブロック、既定はwinsoundで再生)
+        """
+        play_wave(wave)
+
+class ComBackend(Backend):
+    """
+    CeVIO COMコンポーネント(pywin32)を利用するバックエンド
+    pywin32は生成時に読み込む
+
+    Raises :
+      ImportError : pywin32が導入されていない場合の例外
+    """
+
+    def __init__(self) -> None:
+        from win32com import client
+        self._client = client
+
+    def Dispatch(self, progid:str):
+        return self._client.Dispatch(progid)
+
+    @contextmanager
+    def apartment(self):
+        # COMオブジェクトはスレッドごとにSTAを初期化して利用する
+        import pythoncom
+        pythoncom.CoInitialize()
+        try:
+            yield
+        finally:
+            pythoncom.CoUninitialize()
+
+def play_wave(wave:bytes) -> None:
+    """
+    WAV(bytes)をwinsoundで再生(再生終了までブロック)
+    """
+    import winsound
+    winsound.PlaySound(wave, winsound.SND_MEMORY)
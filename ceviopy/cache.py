@@ -0,0 +1,92 @@
+from collections import OrderedDict
+import threading
+
+class AudioCache:
+    """
+    合成済み音声(WAV)のメモリキャッシュ
+    合計サイズ(バイト数)が上限を超えた場合、最も古く使われたものから破棄する
+
+    Examples:
+        cache = AudioCache(max_bytes=64 * 1024 * 1024)
+        cevio = Cevio("AI", cache=cache)
+    """
+
+    def __init__(self, max_bytes:int=64 * 1024 * 1024) -> None:
+        """
+        Args:
+            max_bytes (int): 保持する音声の合計サイズの上限(バイト)
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key:str):
+        """
+        キャッシュ取得
+
+        Args:
+            key (str): 合成結果のキー
+
+        Returns:
+            wave (bytes | None): WAV、キャッシュにない場合はNone
+        """
+        with self._lock:
+            wave = self._entries.get(key)
+            if wave is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return wave
+
+    def put(self, key:str, wave:bytes) -> None:
+        """
+        キャッシュ登録(上限を超える大きさのものは登録しない)
+
+        Args:
+            key (str): 合成結果のキー
+            wave (bytes): WAV
+        """
+        if len(wave) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = wave
+            self._bytes += len(wave)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        キャッシュ全削除
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        キャッシュ統計
+
+        Returns:
+            stats (dict): 'entries' 件数, 'bytes' 合計サイズ, 'hits' ヒット数, 'misses' ミス数, 'evictions' 破棄数
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
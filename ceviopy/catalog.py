@@ -0,0 +1,158 @@
+import json
+
+# コンディション(和名: 英語名)
+TALK_NAMES = {
+    "大きさ":"Volume",
+    "速さ":"Speed",
+    "高さ":"Tone",
+    "抑揚":"ToneScale",
+    "声質":"Alpha"
+}
+
+class CastCatalog:
+    """
+    利用可能なキャストと、キャストごとの感情パラメータ(名前と初期値)の一覧
+    一度作成すればCeVIOに問い合わせずにキャスト・パラメータを検証できる
+
+    Examples:
+        catalog = CastCatalog.build(talk)   # CeVIOから作成
+        catalog.save("catalog.json")
+        catalog = CastCatalog.load("catalog.json")   # CeVIOなしで読み込み
+        catalog.validate_script([{"Cast": "さとうささら", "Emotion": {"元気": 50}}])
+    """
+
+    def __init__(self, casts:dict) -> None:
+        """
+        Args:
+            casts (dict): {キャスト名: {感情名: 初期値}}
+        """
+        self.casts = {name: dict(emotions) for name, emotions in casts.items()}
+
+    @classmethod
+    def build(cls, talk):
+        """
+        Talkerからキャスト一覧を作成
+        キャストを順に切り替えて感情パラメータを取得するため、作成後のキャスト・感情パラメータは変わる
+
+        Args:
+            talk: Talker COMオブジェクト
+
+        Returns:
+            catalog (CastCatalog): キャスト一覧
+        """
+        castlist = talk.AvailableCasts
+        casts = {}
+        for i in range(0, castlist.Length):
+            name = castlist.At(i)
+            talk.Cast = name
+            components = talk.Components
+            emotions = {}
+            for j in range(0, components.Length):
+                tmp = components.At(j)
+                emotions[tmp.Name] = tmp.Value
+            casts[name] = emotions
+        return cls(casts)
+
+    @classmethod
+    def load(cls, filepath:str):
+        """
+        JSONファイルから読み込み
+        """
+        with open(filepath, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def save(self, filepath:str) -> None:
+        """
+        JSONファイルに保存
+        """
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.casts, f, ensure_ascii=False, indent=4)
+
+    def __contains__(self, name:str) -> bool:
+        return name in self.casts
+
+    def names(self) -> list:
+        """
+        キャスト名の一覧
+        """
+        return list(self.casts)
+
+    def emotions(self, name:str) -> dict:
+        """
+        キャストの感情パラメータ初期値
+
+        Args:
+            name (str): キャスト名
+
+        Returns:
+            emotions (dict): {感情名: 初期値}、キャストが存在しない場合はNone
+        """
+        emotions = self.casts.get(name)
+        return None if emotions is None else dict(emotions)
+
+    def check(self, cast:str=None, talk:dict=None, emotion:dict=None):
+        """
+        キャスト・コンディション・感情パラメータの検証と正規化
+
+        Args:
+            cast (str): キャスト名(Noneの場合、感情名は検証しない)
+            talk (dict): コンディション設定(和名可)
+            emotion (dict): 感情設定
+
+        Returns:
+            result (tuple): (コンディション(英語名・int), 感情(int), エラーメッセージの一覧)
+        """
+        errors = []
+        talk_values = {}
+        for key, value in (talk or {}).items():
+            name = TALK_NAMES.get(key, key)
+            if (name not in TALK_NAMES.values()):
+                errors.append(f"Condition {key} is not included in the list. Please select from the following: [{','.join(TALK_NAMES.values())}]")
+            elif (_is_param_value(value)):
+                talk_values[name] = int(value)
+            else:
+                errors.append(f"Condition {name} value must be an integer between 0 and 100.")
+        emotion_values = {}
+        for key, value in (emotion or {}).items():
+            if (_is_param_value(value)):
+                emotion_values[key] = int(value)
+            else:
+                errors.append(f"Emotion {key} value must be an integer between 0 and 100.")
+        if (cast is not None):
+            if (cast not in self.casts):
+                errors.append(f"{cast} is not included in available cast.")
+            else:
+                names = self.casts[cast]
+                errors += [
+                    f"emotion {key} is not included in the list. Please select it below. [{','.join(names)}]"
+                    for key in emotion_values if key not in names
+                ]
+        return talk_values, emotion_values, errors
+
+    def validate_script(self, lines:list) -> list:
+        """
+        台本(設定の一覧)をまとめて検証
+
+        Args:
+            lines (list): 'Cast', 'talk', 'Emotion'を持つdictの一覧('Cast'を省略した場合は直前の行のキャスト)
+
+        Returns:
+            errors (list): (行番号, エラーメッセージ)の一覧
+        """
+        errors = []
+        cast = None
+        for index, line in enumerate(lines):
+            cast = line.get("Cast") or cast
+            if (cast is None):
+                errors.append((index, "Cast is not specified."))
+                continue
+            _, _, messages = self.check(cast, line.get("talk"), line.get("Emotion"))
+            errors += [(index, message) for message in messages]
+        return errors
+
+def _is_param_value(value) -> bool:
+    # 0～100の整数値のみ
+    try:
+        return 0 <= int(value) <= 100
+    except (TypeError, ValueError):
+        return False
@@ -1,6 +1,23 @@
-from win32com import client
+import collections
+import contextlib
 import json
-import re
+import math
+import os
+import queue
+import threading
+import time
+import unicodedata
+from .apartment import com_apartment
+from .audio import join_waves, wave_duration
+from .backend import ComBackend, play_wave
+from .catalog import CastCatalog, TALK_NAMES
+from .events import CHUNK_FINISHED, CHUNK_STARTED, EVENTS, PARAMS_CHANGED, VALIDATION_ERROR, ChunkEvent, EventBus, ParamsChanged, ValidationError, print_event
+from .instrument import CallRecorder, InstrumentedBackend
+from .liveness import HostMonitor, guarded
+from .markup import parse
+from .pool import TalkerPool
+from .profile import Profile, ProfileCache
+from .text import StreamSegmenter, segment
 
 class Cevio:
     """
@@ -24,9 +41,28 @@ class Cevio:
         "text_count" : 100 # 最大100文字
     }
 
-    def __init__(self, mode:str="AI") -> None:
+    # コンディション(和名: 英語名)
+    _talk_names = TALK_NAMES
+
+    def __init__(self, mode:str="AI", backend=None, player=None, pipeline_depth:int=0, cache=None, store=None, catalog=None, liveness_ttl:float=1.0, liveness_interval:float=None, pool_size:int=4, instrument:bool=False, verbose:bool=False, trace:str=None, markup:bool=False) -> None:
         """
         CeVIO 起動
+
+        Args:
+            mode (str): "AI" または "CCS"
+            backend (Backend): CeVIOとの接続方法(省略時はComBackend、Dispatchを持つオブジェクトも可)
+            player: WAV(bytes)を再生する関数(省略時はbackend.play、なければwinsound)
+            pipeline_depth (int): 先行して合成しておくチャンク数(0の場合は逐次再生)
+            cache (AudioCache): 合成済み音声のキャッシュ(省略時はキャッシュしない)
+            store (AudioStore): 合成済み音声のディスクストア(省略時は保存しない)
+            catalog (CastCatalog): キャスト一覧(省略時は起動時にCeVIOから作成)
+            liveness_ttl (float): CeVIOの起動状態を保持する秒数(0の場合は毎回確認)
+            liveness_interval (float): バックグラウンドで起動状態を確認する間隔(秒、省略時は確認しない)
+            pool_size (int): speak_asで保持する設定済みTalkerの上限
+            instrument (bool): COM呼び出しの回数・時間を記録する(stats()で取得)
+            verbose (bool): 再生テキスト・パラメータの変更・検証エラーを表示する(省略時は表示せず、eventsで通知のみ)
+            trace (str): COMセッションを記録するファイル(.gzの場合は圧縮、TraceReplayerで再生)
+            markup (bool): speak・speak_as・render_batch・render_scriptでインラインマークアップを解析する(省略時は解析しない)
         """
 
         # パラメータ設定
@@ -37,18 +73,58 @@ class Cevio:
         else:
             raise CevioException("mode must be 'AI' or 'CCS'.")
 
+        if (backend is None):
+            backend = _default_backend()
+        self._player = player if player is not None else getattr(backend, "play", play_wave)
+        # COMセッションの記録
+        self.tracer = None
+        if (trace is not None):
+            from .trace import TraceWriter
+            self.tracer = TraceWriter(trace, mode)
+            backend = self.tracer.wrap(backend)
+        # COM呼び出しの記録(無効の場合はCOMオブジェクトを包まない)
+        self.recorder = None
+        if (instrument):
+            self.recorder = CallRecorder()
+            backend = InstrumentedBackend(backend, self.recorder)
+        self._backend = backend
+        self.pipeline_depth = pipeline_depth
+        self.verbose = verbose
+        self.markup = markup
+        # イベント通知(chunk_started, chunk_finished, params_changed, validation_error)
+        self.events = EventBus()
+        if (verbose):
+            for name in EVENTS:
+                self.events.subscribe(name, print_event)
+        self.cache = cache
+        self.store = store
+        # 現在のキャスト・コンディション・感情パラメータのミラー(Noneの場合は次回参照時にCeVIOから取得)
+        self._state = None
+
         # APIオブジェクト生成
-        self.talk = client.Dispatch(self._params["talk_module"])
-        self.control = client.Dispatch(self._params["control_module"])
+        self.talk = self._backend.Dispatch(self._params["talk_module"])
+        self.control = self._backend.Dispatch(self._params["control_module"])
+        self._liveness = HostMonitor(lambda: self.control.IsHostStarted, liveness_ttl)
+        self.pool = TalkerPool(lambda: self._backend.Dispatch(self._params["talk_module"]), self._configure_talker, pool_size)
 
         # start CeVIO AI
         self.start_cevio()
+        if (liveness_interval is not None):
+            self._liveness.start(self._make_probe, liveness_interval, self._com_apartment)
+        # キャスト一覧作成(キャストごとの感情パラメータの初期値も取得)
+        self.catalog = catalog if catalog is not None else CastCatalog.build(self.talk)
+        # ファイルから作成したプロファイルのキャッシュ(activateで利用)
+        self.profiles = ProfileCache(self.catalog)
         # デフォルトはAvailableCastsの一覧の最初
         self.talk.Cast = self.talk.AvailableCasts.At(0)
         if (self.talk.Cast is None):
            raise CevioException(f"Initial cast cannot be selected. If the specified character does not exist in the following cast list, please check for a license. [{','.join(self.get_available_cast())}]")
-        print(f"Cast : {self.talk.Cast}")
+        if (self.verbose):
+            print(f"Cast : {self.talk.Cast}")
+        if (self.tracer is not None):
+            self.tracer.attach(self)
 
+    @guarded
     def get_available_cast(self):
         """
         利用可能なキャスト一覧を出力
@@ -63,12 +139,31 @@ class Cevio:
         # CeVIO起動チェック
         self._check_cevio_status()
 
-        castlist = self.talk.AvailableCasts
-        result = []
-        for i in range(0,castlist.Length):
-            result.append(castlist.At(i))
-        return result
+        return self.catalog.names()
+
+    @guarded
+    def refresh_catalog(self):
+        """
+        キャスト一覧をCeVIOから再作成(キャストを追加・削除した場合に呼び出す)
+        現在のキャスト・感情パラメータは作成後に元に戻す
+
+        Raises :
+          CevioException : CeVIOが起動していない場合の例外
+        """
 
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        state = self._shadow()
+        self.catalog = CastCatalog.build(self.talk)
+        self.profiles.clear(self.catalog)
+        self._state = None
+        if (state["Cast"] in self.catalog):
+            self.talk.Cast = state["Cast"]
+            self._state = {"Cast": state["Cast"], "talk": state["talk"], "Emotion": self.catalog.emotions(state["Cast"])}
+            self.apply(emotion={key: value for key, value in state["Emotion"].items() if key in self._state["Emotion"]})
+
+    @guarded
     def get_cast(self):
         """
         現在のキャストを出力
@@ -79,8 +174,9 @@ class Cevio:
         Raises :
             CevioException : CeVIOが起動していない場合の例外
         """
-        return self.talk.Cast
+        return self._shadow()["Cast"]
 
+    @guarded
     def set_cast(self, name:str):
         """
         キャストの設定
@@ -95,13 +191,18 @@ class Cevio:
         # CeVIO起動チェック
         self._check_cevio_status()
 
-        castlist = self.get_available_cast()
-        if (name in castlist):
-            self.talk.Cast = name
-            print(f"Cast : {self.get_cast()}")
+        if (name in self.catalog):
+            state = self._shadow()
+            if (state["Cast"] != name):
+                self.talk.Cast = name
+                self.events.emit(PARAMS_CHANGED, ParamsChanged, "Cast", {"Cast": (state["Cast"], name)})
+                # キャスト変更で感情パラメータは初期値に戻る
+                state["Cast"] = name
+                state["Emotion"] = self.catalog.emotions(name)
         else:
-            print(f"Cast is not included in the list. Please select from the following : [{''.join(castlist)}]")
+            self.events.emit(VALIDATION_ERROR, ValidationError, "Cast", name, name, tuple(self.get_available_cast()))
 
+    @guarded
     def get_talk_params(self):
         """
         コンディションを取得(キャストに関わらず共通)
@@ -116,14 +217,7 @@ class Cevio:
         # CeVIO起動チェック
         self._check_cevio_status()
 
-        talkparams = {
-            "Volume":self.talk.Volume,  # 音の大きさ(Int)
-            "Speed":self.talk.Speed,  # 話す速さ(Int)
-            "Tone":self.talk.Tone,  # 音の高さ(Int)
-            "ToneScale":self.talk.ToneScale,  # 抑揚(Int)
-            "Alpha":self.talk.Alpha  # 声質(Int)
-        }
-        return talkparams
+        return dict(self._shadow()["talk"])
 
     def set_talk_params(self, params:dict):
         """
@@ -135,6 +229,7 @@ class Cevio:
         for key in params.keys():
             self.set_talk_param(key, params[key])
 
+    @guarded
     def set_talk_param(self, talktype:str, value:int):
         """
         コンディションの設定
@@ -148,13 +243,7 @@ class Cevio:
             ValueError : 値が数値でない場合
         """
         default_params = self.get_talk_params()
-        trans_dict = {
-            "大きさ":"Volume",
-            "速さ":"Speed",
-            "高さ":"Tone",
-            "抑揚":"ToneScale",
-            "声質":"Alpha"
-        }
+        trans_dict = self._talk_names
         changed_params = {}
 
         # コンディションに和名が含まれている場合
@@ -169,28 +258,32 @@ class Cevio:
                     changed_params[talktype] = int(value)
                     self._change_talk_param(talktype, changed_params[talktype])
                 else:
-                    print(f"Condition {talktype} value must be an integer between 0 and 100.")
+                    self.events.emit(VALIDATION_ERROR, ValidationError, "talk", talktype, value)
             else:
-                print(f"Condition {talktype} value must be an integer between 0 and 100.")
+                self.events.emit(VALIDATION_ERROR, ValidationError, "talk", talktype, value)
         else:
-            print(f"Condition {talktype} is not included in the list. Please select from the following: [{','.join(trans_dict.values())}]")
+            self.events.emit(VALIDATION_ERROR, ValidationError, "talk", talktype, value, tuple(trans_dict.values()))
 
-        # パラメータ差分表示
-        for key in changed_params.keys():
-            if (default_params[key] != changed_params[key]):
-                print(f"{key}: {default_params[key]} -> {changed_params[key]}")
+        # パラメータ差分通知
+        changes = {key: (default_params[key], value) for key, value in changed_params.items() if default_params[key] != value}
+        if (changes):
+            self.events.emit(PARAMS_CHANGED, ParamsChanged, "talk", changes)
 
     def _is_int(self, value):
         try:
             # int型かを判定
             int(value)
-        except ValueError:
+        except (TypeError, ValueError):
             return False
         else:
             return True
 
     def _change_talk_param(self, talktype, value):
-        # コンディション設定
+        # コンディション設定(ミラーと同じ値の場合は書き込まない)
+        state = self._shadow()
+        if (state["talk"][talktype] == value):
+            return
+        state["talk"][talktype] = value
         if talktype == "Volume":
             self.talk.Volume = value
         elif talktype == "Speed":
@@ -202,6 +295,7 @@ class Cevio:
         elif talktype == "Alpha":
             self.talk.Alpha = value
 
+    @guarded
     def get_cast_params(self):
         """
         感情パラメータを取得(キャストによって変化)
@@ -216,19 +310,13 @@ class Cevio:
         # CeVIO起動チェック
         self._check_cevio_status()
 
-        # 感情パラメータ取得
-        castparams = self.talk.Components
-        emotionparams = {}
-        # ループ内で名前と値の取得
-        for i in range(0,castparams.Length):
-            tmp = castparams.At(i)
-            emotionparams[tmp.Name] = tmp.Value
-        return emotionparams
+        return dict(self._shadow()["Emotion"])
 
     def set_cast_params(self, emotions:dict):
         for key in emotions.keys():
             self.set_cast_param(key,emotions[key])
 
+    @guarded
     def set_cast_param(self,emotion,value):
         """
         感情パラメータの設定
@@ -243,19 +331,218 @@ class Cevio:
             # 整数値のみ
             if (self._is_int(value)):
                 if (int(value) >= 0 and int(value) <= 100):
-                    self.talk.Components.ByName(emotion).Value = int(value)
+                    # ミラーと同じ値の場合は書き込まない
+                    if (default_params[emotion] != int(value)):
+                        self.talk.Components.ByName(emotion).Value = int(value)
+                        self._state["Emotion"][emotion] = int(value)
                 else:
-                    print(f"Emotion {emotion} value must be an integer between 0 and 100.")
+                    self.events.emit(VALIDATION_ERROR, ValidationError, "Emotion", emotion, value)
             else:
-                print(f"Emotion {emotion} value must be an integer between 0 and 100.")
+                self.events.emit(VALIDATION_ERROR, ValidationError, "Emotion", emotion, value)
         else:
-            print(f"emotion {emotion} is not included in the list. Please select it below.")
-            print(",".join(default_params.keys()))
-        # パラメータ差分表示
-        changed_params = self.get_cast_params()
-        for key in changed_params.keys():
-            if (default_params[key] != changed_params[key]):
-                print(f"{key}: {default_params[key]} -> {changed_params[key]}")
+            self.events.emit(VALIDATION_ERROR, ValidationError, "Emotion", emotion, value, tuple(default_params.keys()))
+        # パラメータ差分通知
+        if (emotion in default_params and self._state["Emotion"][emotion] != default_params[emotion]):
+            self.events.emit(PARAMS_CHANGED, ParamsChanged, "Emotion", {emotion: (default_params[emotion], self._state["Emotion"][emotion])})
+
+    @guarded
+    def apply(self, cast:str=None, talk:dict=None, emotion:dict=None):
+        """
+        キャスト・コンディション・感情パラメータの一括設定
+        すべての値を検証してから、現在値と異なるものだけをCeVIOへ書き込む(差分は戻り値で返し、params_changedで通知)
+
+        Args:
+            cast (str): キャスト名(省略時は変更しない)
+            talk (dict): コンディション設定(和名可) {'Speed': 50, ...}
+            emotion (dict): 感情設定 {'元気': 50, ...}
+
+        Returns:
+            diff (dict): 変更内容
+                         'Cast' (tuple | None): (変更前, 変更後)、変更がない場合はNone
+                         'talk' (dict): {コンディション名: (変更前, 変更後)}
+                         'Emotion' (dict): {感情名: (変更前, 変更後)}
+
+        Raises :
+          CevioException : CeVIOが起動していない、もしくは設定値が不正な場合の例外(この場合は何も書き込まない)
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        state = self._shadow()
+        # 感情名は変更後のキャストで検証
+        talk_values, emotion_values, errors = self.catalog.check(cast or state["Cast"], talk, emotion)
+        if (errors):
+            raise CevioException("\n".join(errors))
+        return self._write_params(cast, talk_values, emotion_values)
+
+    def _write_params(self, cast, talk_values, emotion_values):
+        # 検証済みの値のうち、ミラーと異なるものだけをCeVIOへ書き込み、差分を返す
+        state = self._shadow()
+        diff = {"Cast": None, "talk": {}, "Emotion": {}}
+        if (cast is not None and cast != state["Cast"]):
+            self.talk.Cast = cast
+            diff["Cast"] = (state["Cast"], cast)
+            state["Cast"] = cast
+            # キャスト変更で感情パラメータは初期値に戻る
+            state["Emotion"] = self.catalog.emotions(cast)
+        for key, value in talk_values.items():
+            if (state["talk"][key] != value):
+                setattr(self.talk, key, value)
+                diff["talk"][key] = (state["talk"][key], value)
+                state["talk"][key] = value
+        components = None
+        for key, value in emotion_values.items():
+            if (state["Emotion"][key] != value):
+                if (components is None):
+                    components = self.talk.Components
+                components.ByName(key).Value = value
+                diff["Emotion"][key] = (state["Emotion"][key], value)
+                state["Emotion"][key] = value
+        if (diff["Cast"] is not None):
+            self.events.emit(PARAMS_CHANGED, ParamsChanged, "Cast", {"Cast": diff["Cast"]})
+        for kind in ("talk", "Emotion"):
+            if (diff[kind]):
+                self.events.emit(PARAMS_CHANGED, ParamsChanged, kind, diff[kind])
+        return diff
+
+    @contextlib.contextmanager
+    def override(self, cast:str=None, **params):
+        """
+        一時的なキャスト・パラメータの変更(withブロックを抜けると元に戻す、例外の場合も戻す)
+        変更前の値はミラーから取得し、現在値と異なるものだけを書き込み・復元する
+
+        Args:
+            cast (str): キャスト名(省略時は変更しない)
+            **params: コンディション(英語名・和名)、感情パラメータ {'Speed': 60, '怒り': 80}
+
+        Returns:
+            diff (dict): 変更内容(applyと同じ形式)
+
+        Raises :
+          CevioException : CeVIOが起動していない、もしくは設定値が不正な場合の例外(この場合は何も書き込まない)
+
+        Examples:
+            with cevio.override(Speed=60, 怒り=80):
+                cevio.speak("いい加減にしてください")
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        talk, emotion = self._split_params(params)
+        state = self._shadow()
+        talk_values, emotion_values, errors = self.catalog.check(cast or state["Cast"], talk, emotion)
+        if (errors):
+            raise CevioException("\n".join(errors))
+        # キャストを変更する場合は、戻した後の感情パラメータをすべて復元
+        saved_emotion = dict(state["Emotion"])
+        diff = self._write_params(cast, talk_values, emotion_values)
+        try:
+            yield diff
+        finally:
+            talk_values = {key: old for key, (old, _) in diff["talk"].items()}
+            if (diff["Cast"] is not None):
+                self._write_params(diff["Cast"][0], talk_values, saved_emotion)
+            else:
+                self._write_params(None, talk_values, {key: old for key, (old, _) in diff["Emotion"].items()})
+
+    def profile(self, source):
+        """
+        検証済みのプロファイルを取得
+        ファイルの場合は更新日時が変わった場合のみ読み込み直す
+
+        Args:
+            source (str | dict | Profile): 設定ファイルのパス、設定辞書(read_dictと同じ形式)、もしくはProfile
+
+        Returns:
+            profile (Profile): 検証済みのプロファイル
+
+        Raises :
+          CevioException : ファイルがない、もしくは設定値が不正な場合の例外
+        """
+        if (isinstance(source, Profile)):
+            return source
+        try:
+            if (isinstance(source, dict)):
+                return Profile.compile(source, self.catalog)
+            return self.profiles.get(os.fspath(source))
+        except FileNotFoundError:
+            raise CevioException(f"'{source}' File not found")
+        except ValueError as e:
+            raise CevioException(str(e))
+
+    @guarded
+    def activate(self, source):
+        """
+        プロファイルへの切り替え
+        現在の設定との差分のみをCeVIOへ書き込む(検証はプロファイル作成時のみ)
+
+        Args:
+            source (str | dict | Profile): 設定ファイルのパス、設定辞書、もしくはProfile
+
+        Returns:
+            result (dict): 'diff' 変更内容(applyと同じ形式), 'writes' CeVIOへの書き込み数, 'seconds' 切り替えにかかった秒数
+
+        Raises :
+          CevioException : CeVIOが起動していない、もしくはプロファイルが不正な場合の例外
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        profile = self.profile(source)
+        start = time.perf_counter()
+        # キャスト一覧の再作成後も使えるか(キャスト・感情名のみ確認)
+        cast = profile.cast or self._shadow()["Cast"]
+        emotions = self.catalog.casts.get(cast)
+        if (emotions is None or any(key not in emotions for key in profile.emotion)):
+            raise CevioException(f"Profile {profile.name} does not match the cast {cast}.")
+        diff = self._write_params(profile.cast, profile.talk, profile.emotion)
+        return {
+            "diff": diff,
+            "writes": (diff["Cast"] is not None) + len(diff["talk"]) + len(diff["Emotion"]),
+            "seconds": time.perf_counter() - start
+        }
+
+    def invalidate(self):
+        """
+        キャスト・コンディション・感情パラメータのミラーを破棄し、次回参照時にCeVIOから再取得する
+        (CeVIO側で直接設定を変更した場合に呼び出す)
+        """
+        self._state = None
+
+    def _shadow(self):
+        # ミラーを取得(未取得、もしくは破棄された場合はCeVIOから取得)
+        if (self._state is None):
+            self._state = {
+                "Cast": self.talk.Cast,
+                "talk": {
+                    "Volume":self.talk.Volume,  # 音の大きさ(Int)
+                    "Speed":self.talk.Speed,  # 話す速さ(Int)
+                    "Tone":self.talk.Tone,  # 音の高さ(Int)
+                    "ToneScale":self.talk.ToneScale,  # 抑揚(Int)
+                    "Alpha":self.talk.Alpha  # 声質(Int)
+                },
+                "Emotion": self._read_components()
+            }
+        return self._state
+
+    def _read_components(self):
+        # 感情パラメータ取得
+        castparams = self.talk.Components
+        emotionparams = {}
+        # ループ内で名前と値の取得
+        for i in range(0,castparams.Length):
+            tmp = castparams.At(i)
+            emotionparams[tmp.Name] = tmp.Value
+        return emotionparams
+
+    def _split_params(self, params):
+        # コンディション(英語名・和名)と感情パラメータが混在した辞書を (コンディション, 感情パラメータ) に分ける
+        talk = {key: value for key, value in params.items() if key in self._talk_names or key in self._talk_names.values()}
+        emotion = {key: value for key, value in params.items() if key not in talk}
+        return talk, emotion
 
     def start_cevio(self):
         """
@@ -268,7 +555,8 @@ class Cevio:
         if not (self.control.IsHostStarted):
             result = self.control.StartHost(False)
             if result == 0:
-                print(f"CeVIO ${self._params['name']} Started.")
+                if (self.verbose):
+                    print(f"CeVIO ${self._params['name']} Started.")
             elif result == -1:
                 raise CevioException("Installation status is unknown.")
             elif result == -2:
@@ -281,15 +569,22 @@ class Cevio:
                 raise CevioException(f"Unknown Error code is {result}.")
         else:
             result = 0
+        self._liveness.update(True)
 
         return result
 
-    def speak(self,text):
+    @guarded
+    def speak(self,text,pipeline_depth:int=None,markup:bool=None):
         """
         セリフの再生
+        マークアップが有効な場合、[怒り=80 Speed=60]...[/] で囲んだ範囲は指定したパラメータで再生する(終了後は元の値に戻す)
 
         Args:
             text (str): セリフ
+            pipeline_depth (int): 先行して合成しておくチャンク数(省略時は初期化時の値)
+                                  1以上の場合、再生中に次のチャンクをWAVに合成しておき、チャンク間の無音をなくす
+                                  キャッシュ利用時は常にWAV経由で再生する
+            markup (bool): インラインマークアップを解析する(省略時は初期化時の値)
 
         Raises :
           CevioException : CeVIOが起動していない、もしくは利用可能なキャスト一覧に含まれていない場合の例外
@@ -298,26 +593,532 @@ class Cevio:
         # CeVIO起動チェック
         self._check_cevio_status()
 
+        if (pipeline_depth is None):
+            pipeline_depth = self.pipeline_depth
+
+        script = self._parse_markup(text, self.get_cast(), markup)
+        if (script is not None):
+            self._speak_script(script, pipeline_depth)
+            return
+
         # CeVIO AI は200文字、CCS は100文字までのため、別途文字の切り詰め
         speech_list = self._text_split(text,self._params["text_count"])
-        for speech in speech_list:
-            print(f"{self.talk.Cast} > {speech}")
-            result = self.talk.Speak(speech)
-            result.Wait()
+        if (pipeline_depth > 0 or self._caching()):
+            self._speak_pipelined([(None, speech) for speech in speech_list], max(pipeline_depth, 1))
+            return
+        cast = self.get_cast()
+        for i, speech in enumerate(speech_list):
+            self._speak_chunk(self.talk, cast, speech, i, len(speech_list))
+
+    def _speak_script(self, script, pipeline_depth):
+        # マークアップの範囲ごとに、直前の範囲と異なるパラメータだけを書き込んで再生
+        state = self._shadow()
+        base = ({key: state["talk"][key] for key in script.talk_keys}, {key: state["Emotion"][key] for key in script.emotion_keys})
+        parts = [((dict(base[0], **segment.talk), dict(base[1], **segment.emotion)), speech) for segment, speech in self._script_parts(script)]
+        try:
+            if (pipeline_depth > 0 or self._caching()):
+                self._speak_pipelined(parts, max(pipeline_depth, 1))
+                return
+            cast = state["Cast"]
+            for i, (params, speech) in enumerate(parts):
+                self._write_params(None, *params)
+                self._speak_chunk(self.talk, cast, speech, i, len(parts))
+        finally:
+            self._write_params(None, *base)
+
+    def _parse_markup(self, text, cast, markup=None):
+        # マークアップを解析(無効の場合、有効なタグを含まない場合はNone)
+        # 感情名はキャストの感情パラメータのみ扱い、それ以外のタグはそのまま読み上げる
+        if not (self.markup if markup is None else markup) or ("[" not in text):
+            return None
+        script = parse(text, frozenset(self.catalog.emotions(cast)))
+        return script if script.marked else None
+
+    def _script_parts(self, script):
+        # 範囲ごとに文字数制限で分割(チャンクは範囲をまたがない)
+        return [(segment, speech) for segment in script.segments for speech in self._text_split(segment.text, self._params["text_count"]) if speech != ""]
+
+    @guarded
+    def speak_as(self, text:str, cast:str=None, talk:dict=None, emotion:dict=None, markup:bool=None):
+        """
+        キャスト・パラメータを指定してセリフを再生
+        設定ごとに設定済みのTalkerを保持し、同じ設定のセリフではキャスト切り替え・パラメータの再設定を行わない
+        (現在のキャスト・パラメータは変更しない)
+
+        Args:
+            text (str): セリフ
+            cast (str): キャスト名(省略時は現在のキャスト)
+            talk (dict): コンディション設定(省略したものは現在の値)
+            emotion (dict): 感情設定(省略したものはキャストの初期値)
+            markup (bool): インラインマークアップを解析する(省略時は初期化時の値)
+
+        Raises :
+          CevioException : CeVIOが起動していない、もしくは設定値が不正な場合の例外
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        state = self._shadow()
+        cast = cast or state["Cast"]
+        talk_values, emotion_values, errors = self.catalog.check(cast, talk, emotion)
+        if (errors):
+            raise CevioException("\n".join(errors))
+        job = {
+            "Cast": cast,
+            "talk": dict(state["talk"], **talk_values),
+            "Emotion": dict(self.catalog.emotions(cast), **emotion_values)
+        }
+        script = self._parse_markup(text, cast, markup)
+        if (script is not None):
+            parts = [(self._segment_job(job, segment), speech) for segment, speech in self._script_parts(script)]
+            for i, (segment_job, speech) in enumerate(parts):
+                self._speak_chunk(self.pool.acquire(segment_job), cast, speech, i, len(parts))
+            return
+        talker = self.pool.acquire(job)
+        speech_list = self._text_split(text, self._params["text_count"])
+        for i, speech in enumerate(speech_list):
+            self._speak_chunk(talker, cast, speech, i, len(speech_list))
+
+    @guarded
+    def speak_stream(self, fragments):
+        """
+        少しずつ届くテキスト(LLMの出力など)を順次再生
+        文の区切り、もしくは文字数制限に達した時点でチャンクを再生し、再生中も続きのテキストを受け付ける
+
+        Args:
+            fragments (Iterable[str] | AsyncIterable[str]): テキストの断片
+
+        Returns:
+            result (dict): 'time_to_first_speak' 最初のチャンクをSpeakに渡すまでの秒数(再生しなかった場合はNone)
+                                                 Speakは非同期のため、CeVIO側の合成時間(実際の音声開始まで)は含まない
+                           'chunks' 再生したチャンク数, 'seconds' 全体の処理時間
+                           AsyncIterableを渡した場合は、上記を返すコルーチン
+
+        Raises :
+          CevioException : CeVIOが起動していない場合の例外
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        if (hasattr(fragments, "__aiter__")):
+            return self._speak_stream_async(fragments)
+
+        stream = _SpeechStream(self)
+        # 断片の受け取りは別スレッド(COMオブジェクトは呼び出し元スレッドからのみ利用)
+        received = queue.Queue()
+        done = object()
+
+        def read():
+            try:
+                for fragment in fragments:
+                    received.put(fragment)
+            except Exception as e:
+                received.put(e)
+            received.put(done)
+
+        threading.Thread(target=read, daemon=True).start()
+        while True:
+            try:
+                fragment = received.get(timeout=None if stream.finished else _SpeechStream.interval)
+            except queue.Empty:
+                stream.pump()
+                continue
+            if (fragment is done):
+                break
+            if (isinstance(fragment, Exception)):
+                raise fragment
+            stream.feed(fragment)
+        stream.close()
+        while not (stream.finished):
+            stream.wait()
+        return stream.report()
+
+    async def _speak_stream_async(self, fragments):
+        import asyncio
+        stream = _SpeechStream(self)
+        iterator = fragments.__aiter__()
+        task = None
+        while True:
+            if (task is None):
+                task = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait({task}, timeout=None if stream.finished else _SpeechStream.interval)
+            if not (done):
+                stream.pump()
+                continue
+            try:
+                fragment = task.result()
+            except StopAsyncIteration:
+                break
+            task = None
+            stream.feed(fragment)
+        stream.close()
+        while not (stream.finished):
+            await asyncio.sleep(_SpeechStream.interval)
+            stream.pump()
+        return stream.report()
+
+    def _speak_chunk(self, talk, cast, speech, index, total):
+        # チャンクを再生し、終了まで待つ
+        self.events.emit(CHUNK_STARTED, ChunkEvent, cast, speech, index, total)
+        start = time.perf_counter()
+        talk.Speak(speech).Wait()
+        self.events.emit(CHUNK_FINISHED, ChunkEvent, cast, speech, index, total, time.perf_counter() - start)
+
+    def _speak_pipelined(self, parts, depth):
+        # 合成(呼び出し元スレッド)と再生(再生スレッド)を並行して実行
+        # COMオブジェクトは呼び出し元スレッドからのみ利用する
+        # partsは(パラメータ, チャンク)の一覧、パラメータがNone以外の場合は合成前に書き込む
+        state = self._shadow()
+        cast = state["Cast"]
+        rendered = queue.Queue(maxsize=depth)
+        errors = []
+
+        def play():
+            while True:
+                item = rendered.get()
+                if item is None:
+                    return
+                if errors:
+                    # 再生エラー後は残りを読み捨て
+                    continue
+                try:
+                    self.events.emit(CHUNK_STARTED, ChunkEvent, cast, item[0], item[2], len(parts))
+                    start = time.perf_counter()
+                    self._player(item[1])
+                    self.events.emit(CHUNK_FINISHED, ChunkEvent, cast, item[0], item[2], len(parts), time.perf_counter() - start)
+                except Exception as e:
+                    errors.append(e)
+
+        player = threading.Thread(target=play, daemon=True)
+        player.start()
+        try:
+            import tempfile
+            with tempfile.TemporaryDirectory(prefix="ceviopy-") as staging:
+                for i, (params, speech) in enumerate(parts):
+                    if (errors):
+                        break
+                    if (speech == ""):
+                        continue
+                    if (params is not None):
+                        self._write_params(None, *params)
+                    key = None
+                    if (self._caching()):
+                        key = _render_key(self._params["name"], cast, state["talk"], state["Emotion"], speech)
+                    rendered.put((speech, self._render_wave(self.talk, speech, os.path.join(staging, f"{i}.wav"), key), i))
+        finally:
+            rendered.put(None)
+            player.join()
+        if (errors):
+            raise errors[0]
+
+    def _caching(self):
+        return self.cache is not None or self.store is not None
+
+    def _lookup_wave(self, key):
+        # キャッシュ、ディスクストアの順に合成済み音声を検索
+        if (self.cache is not None):
+            wave = self.cache.get(key)
+            if (wave is not None):
+                return wave
+        if (self.store is not None):
+            wave = self.store.get(key)
+            if (wave is not None):
+                if (self.cache is not None):
+                    self.cache.put(key, wave)
+                return wave
+        return None
+
+    def _render_wave(self, talk, text, path, key=None):
+        # WAVファイルに合成し、bytesとして読み込む(キーの指定があればキャッシュを利用)
+        if (key is not None):
+            wave = self._lookup_wave(key)
+            if (wave is not None):
+                return wave
+        if not (talk.OutputWaveToFile(text, path)):
+            raise CevioException(f"Failed to output wave file. [{text}]")
+        try:
+            with open(path, "rb") as f:
+                wave = f.read()
+        finally:
+            os.remove(path)
+        if (key is not None and self.cache is not None):
+            self.cache.put(key, wave)
+        if (key is not None and self.store is not None):
+            self.store.put(key, wave)
+        return wave
+
+    @guarded
+    def render_batch(self, items:list, out_dir:str, workers:int=1):
+        """
+        複数セリフをWAVファイルに一括出力
+
+        キャスト・パラメータが同じものをまとめて処理し、切り替え回数を抑える
+        出力済みのファイルはmanifest.jsonlに記録し、再実行時は未出力のものだけを出力する
+
+        Args:
+            items (list): セリフ一覧、要素は以下のdict、もしくは(text, Cast, talk, Emotion)のtuple
+                          'text' (str): セリフ(markup=Trueの場合はインラインマークアップ可)
+                          'Cast' (str): キャスト名(省略時は現在のキャスト)
+                          'talk' (dict): コンディション設定(省略可)
+                          'Emotion' (dict): 感情設定(省略可)
+                          'name' (str): 出力ファイル名(省略時は"{連番}.wav")
+            out_dir (str): 出力先フォルダ
+            workers (int): 並列数(ワーカーごとにTalkerを生成)
+
+        Returns:
+            result (dict): 'rendered' 出力数, 'skipped' 出力済みで省略した数, 'seconds' 処理時間, 'lines_per_second' 出力速度
+
+        Raises :
+          CevioException : CeVIOが起動していない、もしくはパラメータが不正な場合の例外
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        start = time.perf_counter()
+        jobs = self._normalize_batch(items)
+        os.makedirs(out_dir, exist_ok=True)
+        manifest_path = os.path.join(out_dir, "manifest.jsonl")
+
+        # 出力済み一覧(ファイル名: キー)
+        done = {}
+        terminated = True
+        if (os.path.exists(manifest_path)):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    terminated = line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 中断時に書きかけの行は無視
+                        continue
+                    done[entry["file"]] = entry["key"]
+        pending = [job for job in jobs if not (done.get(job["name"]) == job["key"] and os.path.exists(os.path.join(out_dir, job["name"])))]
+
+        # キャスト・パラメータ順に並べ、連続した範囲ごとにワーカーへ分配
+        pending.sort(key=lambda job: job["group"])
+        size = max(1, math.ceil(len(pending) / (max(1, workers) * 4)))
+        batches = queue.Queue()
+        for i in range(0, len(pending), size):
+            batches.put(pending[i:i+size])
+
+        lock = threading.Lock()
+        errors = []
+        with open(manifest_path, "a", encoding="utf-8") as manifest:
+            if not (terminated):
+                # 書きかけの行に続けて書き込まないよう改行
+                manifest.write("\n")
+            def work():
+                with self._com_apartment():
+                    talk = self._backend.Dispatch(self._params["talk_module"])
+                    applied = {}
+                    while not errors:
+                        try:
+                            batch = batches.get_nowait()
+                        except queue.Empty:
+                            return
+                        try:
+                            for job in batch:
+                                self._render_job(talk, applied, job, os.path.join(out_dir, job["name"]))
+                                with lock:
+                                    manifest.write(json.dumps({"file": job["name"], "key": job["key"], "text": job["text"]}, ensure_ascii=False) + "\n")
+                                    manifest.flush()
+                        except Exception as e:
+                            errors.append(e)
+
+            threads = [threading.Thread(target=work, daemon=True) for _ in range(max(1, min(workers, batches.qsize())))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        if (errors):
+            raise errors[0]
+
+        seconds = time.perf_counter() - start
+        return {
+            "rendered": len(pending),
+            "skipped": len(jobs) - len(pending),
+            "seconds": seconds,
+            "lines_per_second": len(pending) / seconds if seconds > 0 else 0.0
+        }
+
+    @guarded
+    def render_script(self, lines:list, filepath:str, gap:float=0.3):
+        """
+        複数キャストの台本を1つのWAVファイルに出力
+
+        キャスト・パラメータが同じセリフをまとめて合成し、切り替え回数を抑えてから、台本の順に結合する
+        (現在のキャスト・パラメータは変更しない)
+
+        Args:
+            lines (list): 台本(セリフの順)、要素は(Cast, params, text)のtuple、もしくは以下のdict
+                          tupleのparamsはコンディション(英語名・和名)と感情パラメータをまとめたdict {'Speed': 60, '怒り': 80}
+                          'text' (str): セリフ(markup=Trueの場合はインラインマークアップ可)
+                          'Cast' (str): キャスト名(省略時は現在のキャスト)
+                          'talk' (dict): コンディション設定(省略可)
+                          'Emotion' (dict): 感情設定(省略可)
+                          'gap' (float): 直前のセリフとの間の無音の長さ(秒、省略時はgap)
+            filepath (str): 出力先のWAVファイル
+            gap (float): セリフ間の無音の長さ(秒)
+
+        Returns:
+            result (dict): 'lines' セリフ数, 'offsets' 各セリフの開始位置(秒), 'duration' 全体の長さ(秒),
+                           'switches' 設定の切り替え回数 {'sequential': 台本の順に合成した場合, 'grouped': まとめて合成した場合}
+                                      それぞれ {'Cast': キャストの切り替え, 'params': キャストが同じでパラメータのみの切り替え}
+                           'switches_avoided' 台本の順に合成した場合より減った切り替え回数, 'seconds' 処理時間
+
+        Raises :
+          CevioException : CeVIOが起動していない、もしくはパラメータが不正な場合の例外
+        """
+
+        # CeVIO起動チェック
+        self._check_cevio_status()
+
+        start = time.perf_counter()
+        items = []
+        for line in lines:
+            if (isinstance(line, (tuple, list))):
+                cast, params, text = line
+                talk, emotion = self._split_params(params or {})
+                line = {"text": text, "Cast": cast, "talk": talk, "Emotion": emotion}
+            items.append(line)
+        if not (items):
+            raise CevioException("No line to render.")
+        jobs = self._normalize_batch(items)
+        # 同じキャスト・パラメータのセリフが連続するよう並べ替え(同じ設定の中では台本の順)
+        order = sorted(range(len(jobs)), key=lambda index: jobs[index]["group"])
+
+        waves = [None] * len(jobs)
+        with self._com_apartment():
+            talk = self._backend.Dispatch(self._params["talk_module"])
+            applied = {}
+            for index in order:
+                waves[index] = self._render_job(talk, applied, jobs[index])
+
+        gaps = [item.get("gap", gap) for item in items[1:]]
+        offsets = [0.0]
+        for wave, silence in zip(waves, gaps):
+            offsets.append(offsets[-1] + wave_duration(wave) + silence)
+        with open(filepath + ".tmp", "wb") as f:
+            f.write(join_waves(waves, gaps))
+        os.replace(filepath + ".tmp", filepath)
+
+        sequential = _count_switches(jobs)
+        grouped = _count_switches([jobs[index] for index in order])
+        return {
+            "lines": len(jobs),
+            "offsets": offsets,
+            "duration": offsets[-1] + wave_duration(waves[-1]),
+            "switches": {"sequential": sequential, "grouped": grouped},
+            "switches_avoided": sum(sequential.values()) - sum(grouped.values()),
+            "seconds": time.perf_counter() - start
+        }
+
+    def _render_job(self, talk, applied, job, filepath=None):
+        # 一括出力の1件分を合成し、WAVを返す(filepathの指定があればファイルにも出力)
+        # ディスクストアのファイルをコピーして済ませた場合はNoneを返す
+        # マークアップを含む場合は、範囲ごとの設定(job)とチャンクの組に分割
+        script = self._parse_markup(job["text"], job["Cast"])
+        if (script is None):
+            parts = [(job, speech) for speech in self._text_split(job["text"], self._params["text_count"]) if speech != ""]
+        else:
+            parts = [(self._segment_job(job, segment), speech) for segment, speech in self._script_parts(script)]
+        wave = None
+        if (self._caching()):
+            # 全チャンクが合成済みであれば、Talkerを使わずにコピー
+            defaults = self.catalog.emotions(job["Cast"])
+            keys = [_render_key(self._params["name"], part["Cast"], part["talk"], dict(defaults, **part["Emotion"]), speech) for part, speech in parts]
+            if (filepath is not None and len(keys) == 1 and self.cache is None and self.store.copy_to(keys[0], filepath + ".tmp")):
+                os.replace(filepath + ".tmp", filepath)
+                return None
+            waves = [self._lookup_wave(key) for key in keys]
+            if (None not in waves):
+                wave = join_waves(waves)
+
+        if (wave is None):
+            waves = []
+            import tempfile
+            with tempfile.TemporaryDirectory(prefix="ceviopy-") as staging:
+                for i, (part, speech) in enumerate(parts):
+                    # 前のチャンクと異なるパラメータのみ書き込み
+                    emotion = self._configure_talker(talk, applied, part)
+                    key = _render_key(self._params["name"], part["Cast"], part["talk"], emotion, speech)
+                    waves.append(self._render_wave(talk, speech, os.path.join(staging, f"{i}.wav"), key))
+            wave = join_waves(waves)
+        if (filepath is not None):
+            with open(filepath + ".tmp", "wb") as f:
+                f.write(wave)
+            os.replace(filepath + ".tmp", filepath)
+        return wave
+
+    def _normalize_batch(self, items):
+        # 一括出力の入力を検証し、dictに揃える
+        current = self.get_cast()
+        current_talk = self.get_talk_params()
+        jobs = []
+        names = set()
+        for index, item in enumerate(items):
+            if (isinstance(item, (tuple, list))):
+                item = dict(zip(("text", "Cast", "talk", "Emotion"), item))
+            cast = item.get("Cast") or current
+            talk_values, emotion, errors = self.catalog.check(cast, item.get("talk"), item.get("Emotion"))
+            if (errors):
+                raise CevioException("\n".join(errors))
+            # 指定のないコンディションは現在の値を引き継ぐ
+            talk = dict(current_talk, **talk_values)
+            name = item.get("name") or f"{index:06d}.wav"
+            if (name in names):
+                raise CevioException(f"Duplicate file name {name}.")
+            names.add(name)
+            group = (cast, sorted(talk.items()), sorted(emotion.items()))
+            jobs.append({
+                "text": item["text"],
+                "Cast": cast,
+                "talk": talk,
+                "Emotion": emotion,
+                "name": name,
+                "group": group,
+                "key": _render_key(self._params["name"], cast, talk, emotion, item["text"])
+            })
+        return jobs
+
+    def _segment_job(self, job, segment):
+        # マークアップの範囲の設定(jobの値を範囲の値で上書き)
+        return dict(job, talk=dict(job["talk"], **segment.talk), Emotion=dict(job["Emotion"], **segment.emotion))
+
+    def _configure_talker(self, talk, applied, job):
+        # Talkerに設定を反映(前回反映した値と異なるもののみ書き込み)
+        # 戻り値は反映後の感情パラメータ全体
+        if (applied.get("Cast") != job["Cast"]):
+            talk.Cast = job["Cast"]
+            # キャスト変更で感情パラメータは初期値に戻る
+            defaults = self.catalog.emotions(job["Cast"])
+            applied.clear()
+            applied.update({"Cast": job["Cast"], "talk": {}, "defaults": defaults, "Emotion": dict(defaults)})
+        for key, value in job["talk"].items():
+            if (applied["talk"].get(key) != value):
+                setattr(talk, key, value)
+                applied["talk"][key] = value
+        # 指定のない感情パラメータは初期値に戻す
+        emotion = dict(applied["defaults"], **job["Emotion"])
+        components = None
+        for key, value in emotion.items():
+            if (applied["Emotion"][key] != value):
+                if (components is None):
+                    components = talk.Components
+                components.ByName(key).Value = value
+                applied["Emotion"][key] = value
+        return emotion
+
+    def _com_apartment(self):
+        # ワーカースレッド用のCOMアパートメント
+        return com_apartment(self._backend)
 
     def _text_split(self,text,nums):
-        # 文章の切れる部分で分割
-        text = re.sub(r"([、|。|，|．|,|.|・|\r\n|\n|\t| |　])",r"\1<SPLITED_TEXT>",text)
-        splited_text = re.split("<SPLITED_TEXT>",text)
-        return_text = [""]
-        # 可能な限り文字詰め(CeVIOの文字数制限)
-        # 文字数が制限以下ならそのまま、制限以上なら分割
-        for t in splited_text:
-            if len(return_text[len(return_text)-1]+t) <= nums:
-                return_text[len(return_text)-1] += t
-            else:
-                return_text.append(t)
-        return return_text
+        # 文章の切れる部分で分割(区切り文字がない場合はnums文字で強制的に分割)
+        return list(segment(text, nums))
 
     def make_speech_mode(self):
         """
@@ -330,6 +1131,7 @@ class Cevio:
         self.set_cast_param("怒り", 72)
         self.set_cast_param("哀しみ", 26)
 
+    @guarded
     def read_json(self,filepath:str):
         """
         設定ファイル読み込み & キャラクター設定
@@ -358,14 +1160,15 @@ class Cevio:
         try:
             self.set_talk_params(params["talk"])
         except Exception:
-            print(f"Condition is an invalid value.")
+            self.events.emit(VALIDATION_ERROR, ValidationError, "talk", None, params.get("talk"))
 
         # 感情設定
         try:
             self.set_cast_params(params["Emotion"])
         except Exception:
-            print(f"Emotion is an invalid value.")
+            self.events.emit(VALIDATION_ERROR, ValidationError, "Emotion", None, params.get("Emotion"))
 
+    @guarded
     def read_dict(self, params: dict):
         """
         設定辞書読み込み & キャラクター設定
@@ -394,6 +1197,24 @@ class Cevio:
         if "Emotion" in params:
             self.set_cast_params(params["Emotion"])
 
+    def stats(self, reset:bool=False):
+        """
+        COM呼び出しの統計(instrument=Trueの場合のみ)
+        呼び出し元の公開メソッドごと、COMオブジェクトのメンバーごとの回数・時間の分布
+
+        Args:
+            reset (bool): 取得後に記録を消去する
+
+        Returns:
+            stats (dict | None): CallRecorder.stats() の結果、記録していない場合None
+        """
+        if (self.recorder is None):
+            return None
+        result = self.recorder.stats()
+        if (reset):
+            self.recorder.reset()
+        return result
+
     def _check_cevio_status(self) -> None:
         """
         CeVIO起動状態チェック
@@ -401,14 +1222,136 @@ class Cevio:
         Raises :
           CevioException : CeVIOが起動していない場合の例外
         """
-        if not (self.control.IsHostStarted):
+        if not (self._liveness.is_started()):
             raise CevioException("CeVIO is not running.")
 
+    def _make_probe(self):
+        # バックグラウンド確認用(確認用スレッドで専用のServiceControlを生成)
+        control = self._backend.Dispatch(self._params["control_module"])
+        return lambda: control.IsHostStarted
+
+    def close(self):
+        """
+        バックグラウンドでの起動状態の確認を停止し、通知待ちのイベントを届けて終了(COMセッションの記録も終了)
+        """
+        self._liveness.stop()
+        self.events.close()
+        if (self.tracer is not None):
+            self.tracer.close()
+
+class _SpeechStream:
+    """
+    speak_streamの再生状態(確定したチャンクを順に再生し、最初のチャンクをSpeakに渡すまでの時間を計測)
+    """
+
+    # 再生中に再生完了を確認する間隔(秒)
+    interval = 0.02
+
+    def __init__(self, cevio:Cevio) -> None:
+        self._talk = cevio.talk
+        self._events = cevio.events
+        self._cast = cevio.get_cast()
+        self._segmenter = StreamSegmenter(cevio._params["text_count"])
+        self._pending = collections.deque()
+        self._state = None
+        self._start = time.perf_counter()
+        self._first_speak = None
+        self._chunks = 0
+        # 再生中のチャンク(テキスト, 再生開始時刻)
+        self._speech = None
+
+    @property
+    def speaking(self) -> bool:
+        return self._state is not None and not self._state.IsCompleted
+
+    @property
+    def finished(self) -> bool:
+        return not self._pending and not self.speaking
+
+    def feed(self, fragment:str) -> None:
+        self._pending.extend(self._segmenter.feed(fragment))
+        self.pump()
+
+    def close(self) -> None:
+        self._pending.extend(self._segmenter.flush())
+        self.pump()
+
+    def pump(self) -> None:
+        # 再生中でなければ次のチャンクを再生
+        if (self.speaking):
+            return
+        self._finish_chunk()
+        if not (self._pending):
+            return
+        speech = self._pending.popleft()
+        self._events.emit(CHUNK_STARTED, ChunkEvent, self._cast, speech, self._chunks)
+        self._state = self._talk.Speak(speech)
+        self._speech = (speech, time.perf_counter())
+        self._chunks += 1
+        if (self._first_speak is None):
+            self._first_speak = time.perf_counter() - self._start
+
+    def _finish_chunk(self) -> None:
+        # 再生を終えたチャンクの通知
+        if (self._speech is None):
+            return
+        speech, start = self._speech
+        self._speech = None
+        self._events.emit(CHUNK_FINISHED, ChunkEvent, self._cast, speech, self._chunks - 1, None, time.perf_counter() - start)
+
+    def wait(self) -> None:
+        if (self._state is not None):
+            self._state.Wait()
+        self.pump()
+
+    def report(self) -> dict:
+        self._finish_chunk()
+        return {
+            "time_to_first_speak": self._first_speak,
+            "chunks": self._chunks,
+            "seconds": time.perf_counter() - self._start
+        }
+
+def _render_key(mode:str, cast:str, talk:dict, emotion:dict, text:str) -> str:
+    """
+    音声合成結果を一意に識別するキー(パラメータと正規化したテキストのハッシュ)
+    """
+    import hashlib
+    text = unicodedata.normalize("NFKC", text).strip()
+    canonical = json.dumps([mode, cast, talk, emotion, text], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _count_switches(jobs:list) -> dict:
+    """
+    jobsを順に合成した場合の設定の切り替え回数(最初の設定も1回と数える)
+    """
+    switches = {"Cast": 0, "params": 0}
+    previous = None
+    for job in jobs:
+        if (previous is None or job["Cast"] != previous["Cast"]):
+            switches["Cast"] += 1
+        elif (job["group"] != previous["group"]):
+            switches["params"] += 1
+        previous = job
+    return switches
+
+def _default_backend():
+    """
+    既定のバックエンド(ComBackend)
+    pywin32は初めてCevioを生成する時に読み込む(インポート時には読み込まない)
+    """
+    try:
+        return ComBackend()
+    except ImportError:
+        # pywin32がない環境(Linux等)ではbackendの指定が必須
+        raise CevioException("pywin32 is not installed. Please specify a backend.")
+
 class CevioException(Exception):
     '''
     例外：CeVIO処理全般エラー
     '''
     def __init__(self, message) ->None:
+        self.message = message
         self._messege = f'Error : {message}'
 
     def __str__(self) -> None:
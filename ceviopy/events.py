@@ -0,0 +1,219 @@
+import queue
+import threading
+
+# イベント名
+CHUNK_STARTED = "chunk_started"         # チャンクの再生開始(ChunkEvent)
+CHUNK_FINISHED = "chunk_finished"       # チャンクの再生終了(ChunkEvent)
+PARAMS_CHANGED = "params_changed"       # キャスト・パラメータの変更(ParamsChanged)
+VALIDATION_ERROR = "validation_error"   # 設定値の検証エラー(ValidationError)
+
+EVENTS = (CHUNK_STARTED, CHUNK_FINISHED, PARAMS_CHANGED, VALIDATION_ERROR)
+
+class ChunkEvent:
+    """
+    チャンクの再生開始・終了
+
+    Attributes:
+        cast (str): キャスト名
+        text (str): チャンクのテキスト
+        index (int): チャンクの番号(0から)
+        total (int | None): チャンク数(speak_stream等で未確定の場合None)
+        seconds (float | None): 再生にかかった秒数(chunk_finishedのみ)
+    """
+
+    __slots__ = ("cast", "text", "index", "total", "seconds")
+
+    def __init__(self, cast:str, text:str, index:int, total:int=None, seconds:float=None) -> None:
+        self.cast = cast
+        self.text = text
+        self.index = index
+        self.total = total
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return f"ChunkEvent(cast={self.cast!r}, text={self.text!r}, index={self.index}, total={self.total}, seconds={self.seconds})"
+
+class ParamsChanged:
+    """
+    キャスト・パラメータの変更
+
+    Attributes:
+        kind (str): "Cast", "talk"(コンディション), "Emotion"(感情パラメータ)
+        changes (dict): {名前: (変更前, 変更後)}、キャストの場合は {"Cast": (変更前, 変更後)}
+    """
+
+    __slots__ = ("kind", "changes")
+
+    def __init__(self, kind:str, changes:dict) -> None:
+        self.kind = kind
+        self.changes = changes
+
+    def __repr__(self) -> str:
+        return f"ParamsChanged(kind={self.kind!r}, changes={self.changes!r})"
+
+class ValidationError:
+    """
+    設定値の検証エラー(set_cast, set_talk_param, set_cast_param等で設定しなかった値)
+
+    Attributes:
+        kind (str): "Cast", "talk"(コンディション), "Emotion"(感情パラメータ)
+        name (str | None): パラメータ名(値全体が不正な場合None)
+        value: 設定しようとした値
+        choices (tuple | None): 名前が一覧にない場合、選択可能な名前
+    """
+
+    __slots__ = ("kind", "name", "value", "choices")
+
+    # 表示名
+    _labels = {"Cast": "Cast", "talk": "Condition", "Emotion": "Emotion"}
+
+    def __init__(self, kind:str, name, value, choices:tuple=None) -> None:
+        self.kind = kind
+        self.name = name
+        self.value = value
+        self.choices = choices
+
+    @property
+    def message(self) -> str:
+        """
+        エラーメッセージ(参照した時に作成)
+        """
+        label = self._labels.get(self.kind, self.kind)
+        if (self.name is None):
+            return f"{label} is an invalid value."
+        if (self.choices is not None):
+            return f"{label} {self.name} is not included in the list. Please select from the following: [{','.join(self.choices)}]"
+        return f"{label} {self.name} value must be an integer between 0 and 100."
+
+    def __repr__(self) -> str:
+        return f"ValidationError(kind={self.kind!r}, name={self.name!r}, value={self.value!r})"
+
+class EventBus:
+    """
+    イベントの通知
+    購読者がいないイベントはペイロードを作成せずに捨てる
+    購読者は専用スレッドで順に呼び出すため、再生中のスレッドは購読者の処理を待たない
+
+    Examples:
+        talk.events.subscribe("chunk_started", lambda event: print(event.text))
+    """
+
+    def __init__(self) -> None:
+        self._listeners = {}
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+
+    def subscribe(self, name:str, callback):
+        """
+        イベントの購読
+
+        Args:
+            name (str): イベント名(EVENTS)
+            callback: イベントのペイロードを受け取る関数
+
+        Returns:
+            unsubscribe: 購読を解除する関数
+
+        Raises :
+          ValueError : イベント名が不正な場合の例外
+        """
+        if name not in EVENTS:
+            raise ValueError(f"event must be one of [{','.join(EVENTS)}].")
+        with self._lock:
+            if self._thread is None:
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name="ceviopy-events", daemon=True)
+                self._thread.start()
+            # 通知中の一覧を変更しないよう、購読ごとに作り直す
+            self._listeners[name] = self._listeners.get(name, ()) + (callback,)
+        return lambda: self.unsubscribe(name, callback)
+
+    def unsubscribe(self, name:str, callback) -> None:
+        """
+        イベントの購読を解除
+        """
+        with self._lock:
+            listeners = tuple(listener for listener in self._listeners.get(name, ()) if listener != callback)
+            if listeners:
+                self._listeners[name] = listeners
+            else:
+                self._listeners.pop(name, None)
+
+    def listening(self, name:str) -> bool:
+        """
+        イベントの購読者がいるか
+        """
+        return name in self._listeners
+
+    def emit(self, name:str, factory, *args) -> None:
+        """
+        イベントの通知(購読者がいない場合はペイロードを作成しない)
+
+        Args:
+            name (str): イベント名
+            factory: ペイロードを作成する関数(クラス)
+            *args: factoryの引数
+        """
+        listeners = self._listeners.get(name)
+        if not listeners:
+            return
+        self._queue.put((listeners, factory(*args)))
+
+    def flush(self, timeout:float=None) -> bool:
+        """
+        通知済みのイベントがすべて購読者に届くまで待つ
+
+        Returns:
+            result (bool): 届いた場合True、タイムアウトした場合False
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """
+        通知済みのイベントを届けた後、通知用スレッドを終了
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._listeners = {}
+        if thread is not None:
+            self._queue.put(None)
+            if threading.current_thread() is not thread:
+                thread.join()
+
+    def _run(self, jobs) -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            if isinstance(job, threading.Event):
+                job.set()
+                continue
+            listeners, payload = job
+            for callback in listeners:
+                try:
+                    callback(payload)
+                except Exception:
+                    # 購読者のエラーで通知を止めない
+                    import traceback
+                    traceback.print_exc()
+
+def print_event(payload) -> None:
+    """
+    イベントを従来の形式で表示する購読者(Cevio(verbose=True)で利用)
+    """
+    if isinstance(payload, ChunkEvent):
+        if payload.seconds is None:
+            print(f"{payload.cast} > {payload.text}")
+    elif isinstance(payload, ParamsChanged):
+        for key, (old, new) in payload.changes.items():
+            if payload.kind == "Cast":
+                print(f"Cast : {new}")
+            else:
+                print(f"{key}: {old} -> {new}")
+    elif isinstance(payload, ValidationError):
+        print(payload.message)
@@ -0,0 +1,128 @@
+import math
+import sys
+import threading
+import time
+from .apartment import com_apartment
+from .backend import Backend, play_wave
+from .proxy import PLAIN_TYPES, ComProxy, dispatch_label
+
+# 記録するメンバー名の末尾(種別: 末尾)
+_SUFFIXES = {"g": "", "s": "=", "c": "()"}
+
+class CallRecorder:
+    """
+    COM呼び出しの記録
+    呼び出し元のCevioの公開メソッドごと、COMオブジェクトのメンバーごとに回数と時間の分布を集計する
+
+    メンバー名の表記
+        Talker.Speed    : プロパティの取得
+        Talker.Speed=   : プロパティの設定
+        Talker.Speak()  : メソッドの呼び出し
+    戻り値のCOMオブジェクトは "Talker.Components.At()" のように取得元のメンバー名を続けて表す
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def record(self, member:str, seconds:float) -> None:
+        """
+        呼び出し1回分を記録(呼び出し元のCevioのメソッドは呼び出し履歴から特定)
+
+        Args:
+            member (str): メンバー名
+            seconds (float): 呼び出しにかかった時間(秒)
+        """
+        method = _caller()
+        # 2のべき乗秒ごとの区間(1µs未満はまとめる)
+        bucket = max(math.frexp(seconds)[1], -20) if seconds > 0 else -20
+        with self._lock:
+            entry = self._entries.get((method, member))
+            if entry is None:
+                entry = self._entries[(method, member)] = {"count": 0, "seconds": 0.0, "max": 0.0, "histogram": {}}
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["histogram"][bucket] = entry["histogram"].get(bucket, 0) + 1
+
+    def reset(self) -> None:
+        """
+        記録を消去
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        集計結果
+
+        Returns:
+            stats (dict): 'calls' 呼び出し回数, 'seconds' 合計時間,
+                          'methods' {Cevioのメソッド: {'calls', 'seconds', 'members': {メンバー名: 集計}}}
+                          メンバーごとの集計は 'count', 'seconds', 'mean', 'max',
+                          'histogram' [[区間の上限(秒), 回数], ...]
+                          Cevioのメソッド外(scheduler等から直接呼び出した場合)は "-" に集計
+        """
+        with self._lock:
+            entries = [(key, dict(entry, histogram=dict(entry["histogram"]))) for key, entry in self._entries.items()]
+        methods = {}
+        for (method, member), entry in sorted(entries, key=lambda item: item[0]):
+            summary = methods.setdefault(method, {"calls": 0, "seconds": 0.0, "members": {}})
+            summary["calls"] += entry["count"]
+            summary["seconds"] += entry["seconds"]
+            summary["members"][member] = {
+                "count": entry["count"],
+                "seconds": entry["seconds"],
+                "mean": entry["seconds"] / entry["count"],
+                "max": entry["max"],
+                "histogram": [[2.0 ** bucket, count] for bucket, count in sorted(entry["histogram"].items())]
+            }
+        return {
+            "calls": sum(summary["calls"] for summary in methods.values()),
+            "seconds": sum(summary["seconds"] for summary in methods.values()),
+            "methods": methods
+        }
+
+class InstrumentedBackend(Backend):
+    """
+    COM呼び出しを記録するバックエンド
+    Dispatchが返すCOMオブジェクトをプロキシで包み、プロパティの取得・設定、メソッドの呼び出しを記録する
+    Cevio(instrument=True)の場合に利用し、無効の場合は包まないため処理は増えない
+    """
+
+    def __init__(self, backend, recorder:CallRecorder) -> None:
+        """
+        Args:
+            backend: 包むバックエンド
+            recorder (CallRecorder): 記録先
+        """
+        self.backend = backend
+        self.recorder = recorder
+
+    def Dispatch(self, progid:str):
+        return ComProxy(self.backend.Dispatch(progid), dispatch_label(progid), self)
+
+    def apartment(self):
+        return com_apartment(self.backend)
+
+    def play(self, wave:bytes) -> None:
+        getattr(self.backend, "play", play_wave)(wave)
+
+    def observe(self, kind:str, proxy, member:str, args, start:float, value=None, error=None):
+        # ComProxyからの通知(呼び出しを記録し、戻り値のCOMオブジェクトは取得元のメンバー名で包む)
+        member += _SUFFIXES[kind]
+        self.recorder.record(member, time.perf_counter() - start)
+        if (kind == "s" or isinstance(value, PLAIN_TYPES)):
+            return value
+        return ComProxy(value, member, self)
+
+def _caller() -> str:
+    # 呼び出し履歴のうち、最も外側のCevioの公開メソッド(起動時は__init__)
+    method = "-"
+    frame = sys._getframe(2)
+    while frame is not None:
+        parts = getattr(frame.f_code, "co_qualname", frame.f_code.co_name).split(".")
+        if (len(parts) > 1 and parts[0] == "Cevio" and (parts[1] == "__init__" or not parts[1].startswith("_"))):
+            method = f"Cevio.{parts[1]}"
+        frame = frame.f_back
+    return method
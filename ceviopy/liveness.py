@@ -0,0 +1,118 @@
+import functools
+import threading
+import time
+
+# 接続断を示すHRESULT
+DISCONNECTED_HRESULTS = {
+    -2147417848,  # RPC_E_DISCONNECTED
+    -2147023174,  # RPC_S_SERVER_UNAVAILABLE
+    -2147023170,  # RPC_S_CALL_FAILED
+    -2147220995,  # CO_E_OBJNOTCONNECTED
+    -2147417851,  # RPC_E_SERVERFAULT
+}
+
+class HostMonitor:
+    """
+    CeVIO 起動状態の監視
+    IsHostStarted の結果を一定時間(ttl秒)保持し、毎回のプロセス間呼び出しを省く
+    """
+
+    def __init__(self, probe, ttl:float=1.0) -> None:
+        """
+        Args:
+            probe: 起動状態を返す関数(通常は control.IsHostStarted の取得)
+            ttl (float): 起動状態を保持する秒数(0の場合は毎回確認)
+        """
+        self._probe = probe
+        self.ttl = ttl
+        self._started = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._stop = None
+
+    def is_started(self) -> bool:
+        """
+        CeVIOが起動しているか(保持期間内であれば前回の結果を返す)
+        """
+        with self._lock:
+            if self._started is not None and time.monotonic() - self._checked < self.ttl:
+                return self._started
+        started = bool(self._probe())
+        self.update(started)
+        return started
+
+    def update(self, started:bool) -> None:
+        """
+        起動状態を更新
+        """
+        with self._lock:
+            self._started = started
+            self._checked = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        保持している起動状態を破棄し、次回は必ず確認する
+        """
+        with self._lock:
+            self._started = None
+
+    def start(self, make_probe, interval:float, apartment) -> None:
+        """
+        バックグラウンドでの定期確認を開始
+
+        Args:
+            make_probe: 確認用スレッド内で呼び出し、起動状態を返す関数を生成する関数
+            interval (float): 確認間隔(秒)
+            apartment: 確認用スレッドのCOMアパートメントを用意するコンテキストマネージャー
+        """
+        self.stop()
+        stop = self._stop = threading.Event()
+
+        def run():
+            with apartment():
+                probe = make_probe()
+                while not stop.is_set():
+                    try:
+                        self.update(bool(probe()))
+                    except Exception:
+                        self.invalidate()
+                    stop.wait(interval)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        バックグラウンドでの定期確認を停止
+        """
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+def com_hresult(error:Exception):
+    """
+    COM呼び出しの例外のHRESULT(取得できない場合None)
+    """
+    hresult = getattr(error, "hresult", None)
+    if hresult is None and error.args and isinstance(error.args[0], int):
+        hresult = error.args[0]
+    return hresult
+
+def is_disconnected(error:Exception) -> bool:
+    """
+    COM呼び出しの例外が接続断によるものか
+    """
+    return com_hresult(error) in DISCONNECTED_HRESULTS
+
+def guarded(method):
+    """
+    COM呼び出しが接続断で失敗した場合、起動状態の保持を破棄するデコレーター
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            if is_disconnected(e):
+                self._liveness.invalidate()
+            raise
+    return wrapper
@@ -0,0 +1,122 @@
+import functools
+import re
+from .catalog import TALK_NAMES
+
+# 開始タグ [怒り=80 Speed=60]、終了タグ [/]
+# 「名前=整数」の形でないものはタグとみなさず、そのまま読み上げる
+_TAG = re.compile(r"\[(/|[^\[\]=\s]+=-?\d+(?:[ \t　]+[^\[\]=\s]+=-?\d+)*)\]")
+_PARAM = re.compile(r"([^\[\]=\s]+)=(-?\d+)")
+
+class Segment:
+    """
+    同じパラメータで読み上げる範囲
+
+    Attributes:
+        talk (dict): コンディションの変更(英語名: 値)
+        emotion (dict): 感情パラメータの変更(感情名: 値)
+        text (str): テキスト
+    """
+
+    __slots__ = ("talk", "emotion", "text")
+
+    def __init__(self, talk:dict, emotion:dict, text:str) -> None:
+        self.talk = talk
+        self.emotion = emotion
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Segment(talk={self.talk!r}, emotion={self.emotion!r}, text={self.text!r})"
+
+class Script:
+    """
+    マークアップを解析した結果
+
+    Attributes:
+        segments (tuple): Segmentの一覧(パラメータが同じ連続した範囲は結合済み)
+        marked (bool): タグを含むか
+        talk_keys (tuple): いずれかの範囲で変更するコンディション
+        emotion_keys (tuple): いずれかの範囲で変更する感情パラメータ
+    """
+
+    __slots__ = ("segments", "marked", "talk_keys", "emotion_keys")
+
+    def __init__(self, segments:tuple, marked:bool) -> None:
+        self.segments = segments
+        self.marked = marked
+        self.talk_keys = tuple(sorted({key for segment in segments for key in segment.talk}))
+        self.emotion_keys = tuple(sorted({key for segment in segments for key in segment.emotion}))
+
+    def __repr__(self) -> str:
+        return f"Script(segments={self.segments!r}, marked={self.marked})"
+
+    def text(self) -> str:
+        """
+        タグを除いたテキスト
+        """
+        return "".join(segment.text for segment in self.segments)
+
+@functools.lru_cache(maxsize=256)
+def parse(text:str, emotions:frozenset=frozenset()) -> Script:
+    """
+    インラインマークアップの解析(同じテキスト・感情名の組み合わせは解析結果を再利用)
+
+    [怒り=80 Speed=60]...[/] の範囲は、指定したパラメータで読み上げる
+    タグは入れ子にでき、内側のタグは外側のタグの値を引き継いで上書きする
+    コンディションは英語名・和名(速さ等)、感情パラメータはemotionsに含まれる名前のみ扱う
+    名前が不明、もしくは値が0～100の範囲外のタグ、対応する開始タグがない[/]は、そのまま読み上げる
+    閉じていないタグはテキストの最後まで
+
+    Args:
+        text (str): マークアップを含むテキスト
+        emotions (frozenset): 感情パラメータの名前(キャストの感情名)
+
+    Returns:
+        script (Script): 解析結果
+    """
+    segments = []
+    stack = [({}, {})]
+    position = 0
+    marked = False
+    for match in _TAG.finditer(text):
+        if (match.group(1) == "/"):
+            if (len(stack) == 1):
+                continue
+            params = None
+        else:
+            params = _params(match.group(1), stack[-1], emotions)
+            if (params is None):
+                continue
+        _append(segments, stack[-1], text[position:match.start()])
+        position = match.end()
+        marked = True
+        if (params is None):
+            stack.pop()
+        else:
+            stack.append(params)
+    _append(segments, stack[-1], text[position:])
+    return Script(tuple(segments), marked)
+
+def _params(body:str, outer:tuple, emotions:frozenset):
+    # 開始タグの値を外側のタグの値に重ねる(扱えない名前・値を含む場合はNone)
+    talk, emotion = dict(outer[0]), dict(outer[1])
+    for name, value in _PARAM.findall(body):
+        value = int(value)
+        if not 0 <= value <= 100:
+            return None
+        if (name in TALK_NAMES or name in TALK_NAMES.values()):
+            talk[TALK_NAMES.get(name, name)] = value
+        elif (name in emotions):
+            emotion[name] = value
+        else:
+            return None
+    return (talk, emotion)
+
+def _append(segments:list, params:tuple, text:str) -> None:
+    # 範囲を追加(直前と同じパラメータの場合は結合)
+    if not text:
+        return
+    talk, emotion = params
+    if segments and segments[-1].talk == talk and segments[-1].emotion == emotion:
+        segments[-1] = Segment(talk, emotion, segments[-1].text + text)
+    else:
+        segments.append(Segment(talk, emotion, text))
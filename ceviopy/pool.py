@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+class TalkerPool:
+    """
+    キャスト・パラメータごとに設定済みのTalkerを保持するプール
+    同じ設定のセリフは同じTalkerで再生し、キャスト切り替え・パラメータの再設定を省く
+    上限を超えた場合は、最も古く使われたTalkerを新しい設定に切り替えて使い回す
+    """
+
+    def __init__(self, create, configure, maxsize:int=4) -> None:
+        """
+        Args:
+            create: Talkerを生成する関数
+            configure: Talkerに設定を反映する関数 configure(talker, applied, job)
+                       appliedはTalkerごとの反映済みの設定(configureが更新する)
+            maxsize (int): 保持するTalkerの上限
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be 1 or more.")
+        self.maxsize = maxsize
+        self._create = create
+        self._configure = configure
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def acquire(self, job:dict):
+        """
+        設定済みのTalkerを取得
+
+        Args:
+            job (dict): 'Cast' キャスト名, 'talk' コンディション設定, 'Emotion' 感情設定
+
+        Returns:
+            talker: 設定済みのTalker
+        """
+        key = (job["Cast"], tuple(sorted(job["talk"].items())), tuple(sorted(job["Emotion"].items())))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+        self._misses += 1
+        if len(self._entries) >= self.maxsize:
+            # 最も古く使われたTalkerを使い回す(反映済みの設定との差分のみ書き込み)
+            _, entry = self._entries.popitem(last=False)
+            self._evictions += 1
+        else:
+            entry = (self._create(), {})
+        self._configure(entry[0], entry[1], job)
+        self._entries[key] = entry
+        return entry[0]
+
+    def clear(self) -> None:
+        """
+        保持しているTalkerをすべて破棄
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        プール統計
+
+        Returns:
+            stats (dict): 'size' 保持数, 'hits' 設定済みのTalkerを使った回数, 'misses' 設定を反映した回数, 'evictions' 使い回した回数
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+from types import MappingProxyType
+
+class Profile:
+    """
+    検証済みのキャスト設定(変更不可)
+    キャスト・コンディション・感情パラメータを一度だけ検証・正規化し、切り替えのたびの検証を省く
+    キャストを指定した場合、感情パラメータは指定しなかったものもキャストの初期値で補う
+
+    Attributes:
+        name (str): プロファイル名(ファイルの場合はパス)
+        cast (str | None): キャスト名(Noneの場合は現在のキャスト)
+        talk (Mapping): コンディション(英語名: 値)、指定したもののみ
+        emotion (Mapping): 感情パラメータ(感情名: 値)
+    """
+
+    __slots__ = ("name", "cast", "talk", "emotion")
+
+    def __init__(self, name:str, cast:str, talk:dict, emotion:dict) -> None:
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "cast", cast)
+        object.__setattr__(self, "talk", MappingProxyType(dict(talk)))
+        object.__setattr__(self, "emotion", MappingProxyType(dict(emotion)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Profile is immutable.")
+
+    def __repr__(self) -> str:
+        return f"Profile(name={self.name!r}, cast={self.cast!r}, talk={dict(self.talk)!r}, emotion={dict(self.emotion)!r})"
+
+    @classmethod
+    def compile(cls, params:dict, catalog, name:str=None):
+        """
+        設定辞書(read_dictと同じ形式)を検証してプロファイルを作成
+
+        Args:
+            params (dict): 'Cast', 'talk', 'Emotion'
+            catalog (CastCatalog): 検証に使うキャスト一覧
+            name (str): プロファイル名
+
+        Returns:
+            profile (Profile): 検証済みのプロファイル
+
+        Raises :
+          ValueError : 設定値が不正な場合の例外(エラーメッセージは改行区切り)
+        """
+        cast = params.get("Cast")
+        talk_values, emotion_values, errors = catalog.check(cast, params.get("talk"), params.get("Emotion"))
+        if (errors):
+            raise ValueError("\n".join(errors))
+        if (cast is not None):
+            emotion_values = dict(catalog.emotions(cast), **emotion_values)
+        return cls(name, cast, talk_values, emotion_values)
+
+class ProfileCache:
+    """
+    ファイルから作成したプロファイルのキャッシュ
+    ファイルの更新日時・サイズが変わった場合のみ読み込み直す
+    """
+
+    def __init__(self, catalog) -> None:
+        """
+        Args:
+            catalog (CastCatalog): 検証に使うキャスト一覧
+        """
+        self.catalog = catalog
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._hits = 0
+
+    def get(self, filepath:str) -> Profile:
+        """
+        ファイルのプロファイル(前回から変更がなければキャッシュを返す)
+
+        Args:
+            filepath (str): 設定ファイル(read_jsonと同じ形式)
+
+        Returns:
+            profile (Profile): 検証済みのプロファイル
+
+        Raises :
+          FileNotFoundError : ファイルがない場合の例外
+          ValueError : 設定値が不正な場合の例外
+        """
+        stat = os.stat(filepath)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if (entry is not None and entry[0] == version):
+                self._hits += 1
+                return entry[1]
+        with open(filepath, "r", encoding="utf-8") as f:
+            profile = Profile.compile(json.load(f), self.catalog, filepath)
+        with self._lock:
+            self._entries[filepath] = (version, profile)
+            self._loads += 1
+        return profile
+
+    def clear(self, catalog=None) -> None:
+        """
+        キャッシュを破棄(catalogを指定した場合は、以後の検証に使うキャスト一覧も変更)
+        """
+        with self._lock:
+            self._entries.clear()
+            if (catalog is not None):
+                self.catalog = catalog
+
+    def stats(self) -> dict:
+        """
+        キャッシュ統計
+
+        Returns:
+            stats (dict): 'entries' 保持数, 'hits' キャッシュを使った回数, 'loads' ファイルを読み込んだ回数
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "loads": self._loads}
@@ -0,0 +1,88 @@
+import time
+import types
+
+# プロキシせずにそのまま返す値の型
+PLAIN_TYPES = (str, int, float, bool, bytes, type(None))
+
+# メソッドとして扱う型(COMオブジェクト自体も呼び出し可能なため、callableでは判定しない)
+METHOD_TYPES = (types.MethodType, types.BuiltinMethodType)
+
+def dispatch_label(progid:str) -> str:
+    """
+    Dispatchで生成したCOMオブジェクトの表示名(Talker, ServiceControl)
+    """
+    return "ServiceControl" if "ServiceControl" in progid else "Talker" if "Talker" in progid else progid
+
+class ComProxy:
+    """
+    COMオブジェクトのプロキシ
+    プロパティの取得・設定、メソッドの呼び出しのたびに observer.observe を呼び出す
+
+    observe(kind, proxy, member, args, start, value=None, error=None)
+        kind : "g" プロパティの取得, "s" プロパティの設定, "c" メソッドの呼び出し
+        member : "Talker.Speed" のようなメンバー名
+        args : 引数(プロパティの設定の場合は設定値)
+        start : 呼び出し開始時刻(time.perf_counter)
+        value : 戻り値(プロパティの設定の場合None)
+        error : 例外(成功した場合None、例外は observe の後に呼び出し元へ送出)
+        戻り値を呼び出し元に返す(COMオブジェクトを包む場合は observe で包む)
+    """
+
+    __slots__ = ("_target", "_label", "_observer", "_oid")
+
+    def __init__(self, target, label:str, observer, oid:int=None) -> None:
+        """
+        Args:
+            target: COMオブジェクト
+            label (str): 表示名(メンバー名の先頭)
+            observer: 呼び出しの通知先
+            oid (int): オブジェクト番号(observerが利用)
+        """
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_label", label)
+        object.__setattr__(self, "_observer", observer)
+        object.__setattr__(self, "_oid", oid)
+
+    def __getattr__(self, name:str):
+        member = f"{self._label}.{name}"
+        start = time.perf_counter()
+        try:
+            value = getattr(self._target, name)
+        except Exception as e:
+            self._observer.observe("g", self, member, (), start, error=e)
+            raise
+        # 別のComProxyを包む場合(計測と記録の併用)、内側のメソッドのプロキシもメソッドとして扱う
+        if isinstance(value, METHOD_TYPES) or isinstance(value, _ComMethod):
+            return _ComMethod(value, self, member)
+        return self._observer.observe("g", self, member, (), start, value)
+
+    def __setattr__(self, name:str, value) -> None:
+        member = f"{self._label}.{name}"
+        start = time.perf_counter()
+        try:
+            setattr(self._target, name, value)
+        except Exception as e:
+            self._observer.observe("s", self, member, (value,), start, error=e)
+            raise
+        self._observer.observe("s", self, member, (value,), start)
+
+class _ComMethod:
+    """
+    COMオブジェクトのメソッドのプロキシ
+    """
+
+    __slots__ = ("_method", "_proxy", "_member")
+
+    def __init__(self, method, proxy:ComProxy, member:str) -> None:
+        self._method = method
+        self._proxy = proxy
+        self._member = member
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        try:
+            value = self._method(*args)
+        except Exception as e:
+            self._proxy._observer.observe("c", self._proxy, self._member, args, start, error=e)
+            raise
+        return self._proxy._observer.observe("c", self._proxy, self._member, args, start, value)
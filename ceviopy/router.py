@@ -0,0 +1,141 @@
+import threading
+from .apartment import ComThread
+from .cevio import Cevio, CevioException
+
+class CevioRouter:
+    """
+    CeVIO AI と CeVIO Creative Studio を同時に利用するルーター
+    キャストを提供しているエンジンに振り分け、両方にある場合は待ち時間の少ない方を使う
+    エンジンごとに専用スレッドで処理するため、AIとCCSは並行して再生する
+
+    Examples:
+        router = CevioRouter()
+        router.casts()
+        ## > {'さとうささら': ['AI', 'CCS'], 'すずきつづみ': ['AI']}
+        future = router.speak("こんにちは", cast="さとうささら")
+        future.result()
+    """
+
+    def __init__(self, modes:tuple=("AI", "CCS"), **kwargs) -> None:
+        """
+        CeVIO 起動(エンジンごとに専用スレッドでCevioを生成)
+        起動できなかったエンジンは使わない(起動時の例外はerrorsに残す)
+
+        Args:
+            modes (tuple): 利用するエンジン
+            **kwargs: Cevioの引数
+
+        Raises :
+          CevioException : どのエンジンも起動できない場合の例外
+        """
+        self._lock = threading.Lock()
+        self._engines = {}
+        # 起動できなかったエンジン {エンジン: 例外}
+        self.errors = {}
+        starting = {}
+        for mode in modes:
+            thread = ComThread(kwargs.get("backend"), name=f"ceviopy-{mode}")
+            starting[mode] = (thread, thread.submit(_start, mode, kwargs))
+        for mode, (thread, future) in starting.items():
+            try:
+                cevio, casts = future.result()
+            except Exception as e:
+                thread.close(wait=False)
+                self.errors[mode] = e
+                continue
+            self._engines[mode] = {"thread": thread, "cevio": cevio, "casts": casts, "load": 0}
+        if not (self._engines):
+            raise CevioException(f"No CeVIO engine is available. [{', '.join(f'{mode}: {e}' for mode, e in self.errors.items())}]")
+
+    def engines(self) -> list:
+        """
+        利用中のエンジン一覧
+        """
+        return list(self._engines)
+
+    def casts(self) -> dict:
+        """
+        キャスト一覧
+
+        Returns:
+            casts (dict): {キャスト名: [エンジン]}
+        """
+        result = {}
+        for mode, engine in self._engines.items():
+            for cast in engine["casts"]:
+                result.setdefault(cast, []).append(mode)
+        return result
+
+    def loads(self) -> dict:
+        """
+        エンジンごとの再生待ちの文字数
+        """
+        with self._lock:
+            return {mode: engine["load"] for mode, engine in self._engines.items()}
+
+    def route(self, cast:str=None) -> str:
+        """
+        キャストを再生するエンジンを選択
+
+        Args:
+            cast (str): キャスト名(省略時はすべてのエンジンが対象)
+
+        Returns:
+            mode (str): エンジン("AI" または "CCS")
+
+        Raises :
+          CevioException : キャストを提供しているエンジンがない場合の例外
+        """
+        candidates = [mode for mode, engine in self._engines.items() if cast is None or cast in engine["casts"]]
+        if not (candidates):
+            raise CevioException(f"{cast} is not included in available cast.")
+        with self._lock:
+            return min(candidates, key=lambda mode: self._engines[mode]["load"])
+
+    def speak(self, text:str, cast:str=None, talk:dict=None, emotion:dict=None, mode:str=None):
+        """
+        セリフの再生(エンジンはキャストと待ち状況から選択、文字数制限はエンジンごと)
+
+        Args:
+            text (str): セリフ
+            cast (str): キャスト名(省略時は選択したエンジンの現在のキャスト)
+            talk (dict): コンディション設定
+            emotion (dict): 感情設定
+            mode (str): エンジンの指定(省略時は自動選択)
+
+        Returns:
+            future (concurrent.futures.Future): 再生完了を待つFuture(結果は再生したエンジン)
+
+        Raises :
+          CevioException : キャストを提供しているエンジンがない場合の例外
+        """
+        if (mode is None):
+            mode = self.route(cast)
+        elif (mode not in self._engines):
+            raise CevioException(f"CeVIO {mode} is not available.")
+        engine = self._engines[mode]
+        with self._lock:
+            engine["load"] += len(text)
+
+        def run():
+            try:
+                engine["cevio"].speak_as(text, cast=cast, talk=talk, emotion=emotion)
+            finally:
+                with self._lock:
+                    engine["load"] -= len(text)
+            return mode
+
+        return engine["thread"].submit(run)
+
+    def close(self) -> None:
+        """
+        再生待ちのセリフを再生した後、終了
+        """
+        for engine in self._engines.values():
+            engine["thread"].submit(engine["cevio"].close)
+            engine["thread"].close()
+
+def _start(mode, kwargs):
+    # エンジン専用スレッドでCevioを生成し、キャスト一覧を取得
+    cevio = Cevio(mode, **kwargs)
+    return cevio, set(cevio.get_available_cast())
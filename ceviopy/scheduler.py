@@ -0,0 +1,301 @@
+import collections
+import heapq
+import itertools
+import threading
+import time
+from .apartment import com_apartment
+from .cevio import Cevio, CevioException
+from .events import CHUNK_FINISHED, CHUNK_STARTED, ChunkEvent
+from .text import segment
+
+# 優先度(小さいほど優先)
+URGENT = 0
+NORMAL = 1
+AMBIENT = 2
+
+class SpeechHandle:
+    """
+    再生予約の状態
+    status : "queued"(待機中), "speaking"(再生中), "done"(完了), "cancelled"(取消), "failed"(失敗)
+    """
+
+    def __init__(self, scheduler, id:int, text:str, priority:int, params:dict) -> None:
+        self.id = id
+        self.text = text
+        self.priority = priority
+        self.params = params
+        self.status = "queued"
+        self.error = None
+        self.submitted = time.monotonic()
+        self._scheduler = scheduler
+        self._chunks = None
+        self._next = 0
+        self._waited = False
+        self._done = threading.Event()
+
+    def cancel(self) -> bool:
+        """
+        再生の取消(SpeechScheduler.cancel)
+        """
+        return self._scheduler.cancel(self)
+
+    def wait(self, timeout:float=None) -> bool:
+        """
+        再生の完了(もしくは取消・失敗)を待つ
+
+        Returns:
+            result (bool): 完了した場合True、タイムアウトした場合False
+        """
+        return self._done.wait(timeout)
+
+    def _finish(self, status:str, error:Exception=None) -> None:
+        self.status = status
+        self.error = error
+        self._done.set()
+
+class SpeechScheduler:
+    """
+    優先度付きの再生キュー
+    優先度の高い予約が入ると再生中のセリフを中断し、後で中断したチャンクから再開する
+    予約ごとにキャスト・パラメータを保持し、順序が入れ替わっても予約時の設定で再生する
+
+    Examples:
+        scheduler = SpeechScheduler("AI")
+        scheduler.submit("いらっしゃいませ", priority=AMBIENT, cast="さとうささら")
+        handle = scheduler.submit("地震です", priority=URGENT, emotion={"怒り": 80})
+        handle.wait()
+        scheduler.metrics()
+    """
+
+    # 再生中に再生完了・中断要求を確認する間隔(秒)
+    interval = 0.02
+
+    def __init__(self, mode:str="AI", preempt:int=URGENT, **kwargs) -> None:
+        """
+        CeVIO 起動(専用スレッドでCevioを生成)
+
+        Args:
+            mode (str): "AI" または "CCS"
+            preempt (int): この優先度以上の予約が入った場合、再生中のより低い優先度のセリフを中断する
+            **kwargs: Cevioの引数
+
+        Raises :
+          CevioException : CeVIOが起動できない場合の例外
+        """
+        self.preempt = preempt
+        self._queue = []
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._current = None
+        self._preempt_at = None
+        self._closed = False
+        self._queue_wait = collections.deque(maxlen=1000)
+        self._preemption_latency = collections.deque(maxlen=1000)
+        self._counts = collections.Counter()
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(mode, kwargs), name="ceviopy-scheduler", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if (self._error is not None):
+            raise self._error
+
+    def submit(self, text:str, priority:int=NORMAL, cast:str=None, talk:dict=None, emotion:dict=None) -> SpeechHandle:
+        """
+        再生予約
+
+        Args:
+            text (str): セリフ
+            priority (int): 優先度(URGENT, NORMAL, AMBIENT、小さいほど優先)
+            cast (str): キャスト名(省略時は起動時のキャスト)
+            talk (dict): コンディション設定(省略したものは起動時の値)
+            emotion (dict): 感情設定(省略したものはキャストの初期値)
+
+        Returns:
+            handle (SpeechHandle): 予約の状態
+
+        Raises :
+          CevioException : パラメータが不正、もしくは終了済みの場合の例外
+        """
+        cast = cast or self._base["Cast"]
+        talk_values, emotion_values, errors = self._cevio.catalog.check(cast, talk, emotion)
+        if (errors):
+            raise CevioException("\n".join(errors))
+        params = {
+            "Cast": cast,
+            "talk": dict(self._base["talk"], **talk_values),
+            "Emotion": dict(self._cevio.catalog.emotions(cast), **emotion_values)
+        }
+        with self._cond:
+            if (self._closed):
+                raise CevioException("Scheduler is closed.")
+            handle = SpeechHandle(self, next(self._ids), text, priority, params)
+            heapq.heappush(self._queue, (priority, handle.id, handle))
+            current = self._current
+            if (current is not None and priority <= self.preempt and priority < current.priority and self._preempt_at is None):
+                self._preempt_at = handle.submitted
+            self._cond.notify_all()
+        return handle
+
+    def cancel(self, handle:SpeechHandle) -> bool:
+        """
+        再生の取消(再生中の場合は停止)
+
+        Returns:
+            result (bool): 取り消した場合True、完了済みの場合False
+        """
+        with self._cond:
+            if (handle.status not in ("queued", "speaking")):
+                return False
+            handle.status = "cancelled"
+            self._counts["cancelled"] += 1
+            self._cond.notify_all()
+            if (handle is not self._current):
+                # キューからは再生時に取り除く
+                handle._finish("cancelled")
+        return True
+
+    @property
+    def events(self):
+        """
+        イベント通知(Cevio.events)
+        """
+        return self._cevio.events
+
+    def pending(self) -> int:
+        """
+        待機中の予約数
+        """
+        with self._cond:
+            return sum(1 for _, _, handle in self._queue if handle.status == "queued")
+
+    def metrics(self) -> dict:
+        """
+        統計
+
+        Returns:
+            metrics (dict): 'queue_wait' 予約から再生開始までの秒数, 'preemption_latency' 中断要求から停止までの秒数
+                            (それぞれ'count', 'mean', 'p95', 'max'), 'spoken', 'cancelled', 'preempted', 'failed' 件数
+        """
+        with self._cond:
+            return {
+                "queue_wait": _summary(self._queue_wait),
+                "preemption_latency": _summary(self._preemption_latency),
+                "spoken": self._counts["spoken"],
+                "cancelled": self._counts["cancelled"],
+                "preempted": self._counts["preempted"],
+                "failed": self._counts["failed"]
+            }
+
+    def close(self, cancel:bool=False) -> None:
+        """
+        終了(cancel=Trueの場合は待機中の予約を取り消し、Falseの場合はすべて再生してから終了)
+        """
+        with self._cond:
+            self._closed = True
+            if (cancel):
+                for _, _, handle in self._queue:
+                    if (handle.status == "queued"):
+                        handle._finish("cancelled")
+                        self._counts["cancelled"] += 1
+                if (self._current is not None):
+                    self._current.status = "cancelled"
+                    self._counts["cancelled"] += 1
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self, mode, kwargs):
+        with com_apartment(kwargs.get("backend")):
+            try:
+                self._cevio = Cevio(mode, **kwargs)
+                self._base = {"Cast": self._cevio.get_cast(), "talk": self._cevio.get_talk_params()}
+            except Exception as e:
+                self._error = e
+                return
+            finally:
+                self._ready.set()
+            try:
+                while True:
+                    handle = self._next()
+                    if (handle is None):
+                        return
+                    self._speak(handle)
+            finally:
+                self._cevio.close()
+
+    def _next(self):
+        # 最も優先度の高い予約を取り出す(なければ待機)
+        with self._cond:
+            while True:
+                while self._queue:
+                    _, _, handle = heapq.heappop(self._queue)
+                    if (handle.status == "queued"):
+                        handle.status = "speaking"
+                        self._current = handle
+                        return handle
+                if (self._closed):
+                    return None
+                self._cond.wait()
+
+    def _speak(self, handle):
+        if not (handle._waited):
+            handle._waited = True
+            self._queue_wait.append(time.monotonic() - handle.submitted)
+        talk = self._cevio.talk
+        try:
+            params = handle.params
+            self._cevio.apply(cast=params["Cast"], talk=params["talk"], emotion=params["Emotion"])
+            if (handle._chunks is None):
+                handle._chunks = list(segment(handle.text, self._cevio._params["text_count"]))
+            events = self._cevio.events
+            while handle._next < len(handle._chunks) and not (self._interrupted(handle)):
+                speech = handle._chunks[handle._next]
+                events.emit(CHUNK_STARTED, ChunkEvent, params["Cast"], speech, handle._next, len(handle._chunks))
+                start = time.perf_counter()
+                state = talk.Speak(speech)
+                while not (state.IsCompleted) and not (self._interrupted(handle)):
+                    with self._cond:
+                        self._cond.wait(self.interval)
+                if not (state.IsCompleted):
+                    talk.Stop()
+                    break
+                events.emit(CHUNK_FINISHED, ChunkEvent, params["Cast"], speech, handle._next, len(handle._chunks), time.perf_counter() - start)
+                handle._next += 1
+        except Exception as e:
+            with self._cond:
+                self._current = None
+                self._preempt_at = None
+                self._counts["failed"] += 1
+            handle._finish("failed", e)
+            return
+
+        with self._cond:
+            self._current = None
+            preempt_at, self._preempt_at = self._preempt_at, None
+            if (handle.status == "cancelled"):
+                handle._finish("cancelled")
+            elif (handle._next < len(handle._chunks)):
+                # 中断したチャンクから再開するため、キューに戻す
+                self._preemption_latency.append(time.monotonic() - preempt_at)
+                self._counts["preempted"] += 1
+                handle.status = "queued"
+                heapq.heappush(self._queue, (handle.priority, handle.id, handle))
+            else:
+                self._counts["spoken"] += 1
+                handle._finish("done")
+
+    def _interrupted(self, handle):
+        # 取消、もしくは優先度の高い予約による中断要求があるか
+        return handle.status == "cancelled" or self._preempt_at is not None
+
+def _summary(samples) -> dict:
+    # 計測値の要約
+    if not (samples):
+        return {"count": 0, "mean": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1]
+    }
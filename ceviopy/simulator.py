@@ -0,0 +1,337 @@
+import collections
+import struct
+import threading
+import time
+from .audio import speed_rate
+from .backend import Backend
+
+class Simulator(Backend):
+    """
+    CeVIO 疑似ホスト(Backend)
+    CeVIOの代わりにCevioへ渡すことで、CeVIOがない環境(Linux等)で動作確認・負荷試験を行う
+    COMのプロセス間呼び出し・起動・音声合成・再生にかかる時間を模擬する
+
+    Examples:
+        sim = Simulator(call_latency=0.0005, startup_time=3.0)
+        cevio = Cevio("AI", backend=sim)
+        sim.calls
+        ## > Counter({'Talker.Cast': 5, 'ServiceControl.IsHostStarted': 2, ...})
+    """
+
+    # 疑似キャスト(キャスト名: 感情パラメータの初期値)
+    default_casts = {
+        "さとうささら": {"普通": 100, "元気": 0, "怒り": 0, "哀しみ": 0},
+        "すずきつづみ": {"クール": 100, "照れ": 0},
+        "タカハシ": {"普通": 100, "元気": 0, "へこみ": 0},
+    }
+
+    def __init__(self, casts:dict=None, synthesis_rate:float=0.002, chars_per_second:float=8.0, sample_rate:int=48000,
+                 call_latency:float=0.0, startup_time:float=0.0) -> None:
+        """
+        Args:
+            casts (dict): キャスト名と感情パラメータ初期値の辞書
+            synthesis_rate (float): 1文字あたりの音声合成時間(秒)
+            chars_per_second (float): Speed=50のときの1秒あたりの読み上げ文字数
+            sample_rate (int): 出力するWAVのサンプリングレート
+            call_latency (float): COMのプロセス間呼び出し1回あたりの時間(秒、プロパティの取得・設定も1回と数える)
+            startup_time (float): StartHostからホストが起動するまでの時間(秒)
+        """
+        self.casts = dict(casts if casts is not None else self.default_casts)
+        self.synthesis_rate = synthesis_rate
+        self.chars_per_second = chars_per_second
+        self.sample_rate = sample_rate
+        self.call_latency = call_latency
+        self.startup_time = startup_time
+        self.calls = collections.Counter()
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """
+        ホストが起動済みか
+        """
+        return self._started_at is not None and time.monotonic() >= self._started_at
+
+    @started.setter
+    def started(self, value:bool) -> None:
+        self._started_at = time.monotonic() if value else None
+
+    def Dispatch(self, progid:str):
+        """
+        win32com.client.Dispatch 互換
+
+        Args:
+            progid (str): COMコンポーネント名
+
+        Returns:
+            SimulatedTalker | SimulatedServiceControl : 疑似COMオブジェクト
+        """
+        if "ServiceControl" in progid:
+            return SimulatedServiceControl(self)
+        if "Talker" in progid:
+            return SimulatedTalker(self)
+        raise ValueError(f"Unknown progid {progid}.")
+
+    def call(self, member:str) -> None:
+        """
+        プロセス間呼び出し1回分の待機と記録
+        """
+        with self._lock:
+            self.calls[member] += 1
+        if (self.call_latency > 0):
+            time.sleep(self.call_latency)
+
+    def reset_calls(self) -> None:
+        """
+        呼び出し回数の記録を消去
+        """
+        with self._lock:
+            self.calls.clear()
+
+    def synthesis_time(self, text:str) -> float:
+        """
+        音声合成にかかる時間(秒)
+        """
+        return len(text) * self.synthesis_rate
+
+    def playback_time(self, text:str, speed:int=50) -> float:
+        """
+        再生時間(秒)、Speed=0で0.5倍速、Speed=100で2倍速
+        """
+        return len(text) / (self.chars_per_second * speed_rate(speed))
+
+    def make_wave(self, seconds:float) -> bytes:
+        """
+        指定秒数の無音WAV(16bit モノラル)を生成
+        """
+        frames = int(seconds * self.sample_rate)
+        data = bytes(frames * 2)
+        header = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + len(data), b"WAVE",
+            b"fmt ", 16, 1, 1, self.sample_rate, self.sample_rate * 2, 2, 16,
+            b"data", len(data)
+        )
+        return header + data
+
+    def play(self, wave:bytes) -> None:
+        """
+        WAVの再生時間だけ待機する疑似プレイヤー
+        """
+        rate, = struct.unpack_from("<I", wave, 28)
+        time.sleep(max(len(wave) - 44, 0) / rate)
+
+class _Member:
+    """
+    呼び出しごとにプロセス間呼び出しの時間がかかるプロパティ
+    """
+
+    def __set_name__(self, owner, name:str) -> None:
+        self._name = name
+        self._label = f"{owner._label}.{name}"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        obj._host.call(self._label)
+        return obj.__dict__[self._name]
+
+    def __set__(self, obj, value) -> None:
+        obj._host.call(self._label)
+        obj.__dict__[self._name] = value
+
+class SimulatedServiceControl:
+    """
+    ServiceControl 疑似オブジェクト
+    """
+
+    _label = "ServiceControl"
+
+    def __init__(self, host:Simulator) -> None:
+        self._host = host
+
+    @property
+    def IsHostStarted(self) -> bool:
+        self._host.call("ServiceControl.IsHostStarted")
+        return self._host.started
+
+    def StartHost(self, noWait:bool) -> int:
+        # noWait=Falseの場合は起動完了まで待つ
+        self._host.call("ServiceControl.StartHost")
+        if self._host._started_at is None:
+            self._host._started_at = time.monotonic() + self._host.startup_time
+        if not noWait:
+            time.sleep(max(self._host._started_at - time.monotonic(), 0))
+        return 0
+
+    def CloseHost(self, mode:int=0) -> None:
+        self._host.call("ServiceControl.CloseHost")
+        self._host.started = False
+
+class SimulatedTalker:
+    """
+    Talker 疑似オブジェクト
+    """
+
+    _label = "Talker"
+    Volume = _Member()
+    Speed = _Member()
+    Tone = _Member()
+    ToneScale = _Member()
+    Alpha = _Member()
+
+    def __init__(self, host:Simulator) -> None:
+        self._host = host
+        self._cast = ""
+        self._components = {}
+        self._lock = threading.Lock()
+        self._state = None
+        for name in ("Volume", "Speed", "Tone", "ToneScale", "Alpha"):
+            self.__dict__[name] = 50
+
+    @property
+    def AvailableCasts(self):
+        self._host.call("Talker.AvailableCasts")
+        return _StringArray(self._host, list(self._host.casts))
+
+    @property
+    def Cast(self) -> str:
+        self._host.call("Talker.Cast")
+        return self._cast
+
+    @Cast.setter
+    def Cast(self, name:str) -> None:
+        # キャスト変更時、感情パラメータは初期値に戻る
+        self._host.call("Talker.Cast")
+        if name in self._host.casts:
+            self._cast = name
+            self._components = dict(self._host.casts[name])
+
+    @property
+    def Components(self):
+        self._host.call("Talker.Components")
+        return _ComponentArray(self._host, self._components)
+
+    def Speak(self, text:str):
+        self._host.call("Talker.Speak")
+        with self._lock:
+            if self._state is not None:
+                self._state._wait()
+            duration = self._host.synthesis_time(text) + self._host.playback_time(text, self.__dict__["Speed"])
+            self._state = SimulatedSpeakingState(self._host, duration)
+            return self._state
+
+    def Stop(self) -> bool:
+        self._host.call("Talker.Stop")
+        with self._lock:
+            if self._state is None or self._state._completed():
+                return False
+            self._state._finish(False)
+            return True
+
+    def GetTextDuration(self, text:str) -> float:
+        self._host.call("Talker.GetTextDuration")
+        return self._host.playback_time(text, self.__dict__["Speed"])
+
+    def OutputWaveToFile(self, text:str, path:str) -> bool:
+        self._host.call("Talker.OutputWaveToFile")
+        if not self._cast or not text:
+            return False
+        time.sleep(self._host.synthesis_time(text))
+        with open(path, "wb") as f:
+            f.write(self._host.make_wave(self._host.playback_time(text, self.__dict__["Speed"])))
+        return True
+
+class SimulatedSpeakingState:
+    """
+    SpeakingState 疑似オブジェクト
+    """
+
+    def __init__(self, host:Simulator, duration:float) -> None:
+        self._host = host
+        self._end = time.monotonic() + duration
+        self._succeeded = True
+
+    @property
+    def IsCompleted(self) -> bool:
+        self._host.call("SpeakingState.IsCompleted")
+        return self._completed()
+
+    @property
+    def IsSucceeded(self) -> bool:
+        self._host.call("SpeakingState.IsSucceeded")
+        return self._completed() and self._succeeded
+
+    def Wait(self) -> None:
+        self._host.call("SpeakingState.Wait")
+        self._wait()
+
+    def Wait_2(self, timeout:float) -> None:
+        self._host.call("SpeakingState.Wait_2")
+        time.sleep(min(max(self._end - time.monotonic(), 0), timeout))
+
+    def _completed(self) -> bool:
+        return time.monotonic() >= self._end
+
+    def _wait(self) -> None:
+        time.sleep(max(self._end - time.monotonic(), 0))
+
+    def _finish(self, succeeded:bool) -> None:
+        self._end = time.monotonic()
+        self._succeeded = succeeded
+
+class _StringArray:
+    def __init__(self, host:Simulator, items:list) -> None:
+        self._host = host
+        self._items = items
+
+    @property
+    def Length(self) -> int:
+        self._host.call("StringArray.Length")
+        return len(self._items)
+
+    def At(self, index:int) -> str:
+        self._host.call("StringArray.At")
+        return self._items[index]
+
+class _ComponentArray:
+    def __init__(self, host:Simulator, values:dict) -> None:
+        self._host = host
+        self._values = values
+
+    @property
+    def Length(self) -> int:
+        self._host.call("Components.Length")
+        return len(self._values)
+
+    def At(self, index:int):
+        self._host.call("Components.At")
+        return _Component(self._host, self._values, list(self._values)[index])
+
+    def ByName(self, name:str):
+        self._host.call("Components.ByName")
+        if name not in self._values:
+            return None
+        return _Component(self._host, self._values, name)
+
+class _Component:
+    def __init__(self, host:Simulator, values:dict, name:str) -> None:
+        self._host = host
+        self._values = values
+        self._name = name
+
+    @property
+    def Name(self) -> str:
+        self._host.call("Component.Name")
+        return self._name
+
+    @property
+    def Value(self) -> int:
+        self._host.call("Component.Value")
+        return self._values[self._name]
+
+    @Value.setter
+    def Value(self, value:int) -> None:
+        self._host.call("Component.Value")
+        self._values[self._name] = value
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+class AudioStore:
+    """
+    合成済み音声(WAV)のディスクストア
+    複数プロセスから同じフォルダを共有可能(索引はSQLite、音声はキーごとのファイル)
+
+    Examples:
+        store = AudioStore("cache/audio", max_bytes=1024 ** 3, max_age=30 * 24 * 3600)
+        cevio = Cevio("AI", store=store)
+    """
+
+    def __init__(self, path:str, max_bytes:int=None, max_age:float=None, verify:bool=True) -> None:
+        """
+        Args:
+            path (str): 保存先フォルダ
+            max_bytes (int): gc()で残す合計サイズの上限(バイト、Noneは無制限)
+            max_age (float): gc()で残す最終利用からの経過秒数(Noneは無制限)
+            verify (bool): 読み込み時に内容のハッシュを検証するか
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.verify = verify
+        self._local = threading.local()
+        os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS audio ("
+                "key TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS audio_accessed ON audio (accessed)")
+
+    def _connect(self):
+        # SQLiteの接続はスレッドごとに保持
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(os.path.join(self.path, "index.sqlite3"), timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _object_path(self, key:str) -> str:
+        return os.path.join(self.path, "objects", key[:2], f"{key}.wav")
+
+    def _lookup(self, key:str):
+        db = self._connect()
+        row = db.execute("SELECT digest FROM audio WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with db:
+            db.execute("UPDATE audio SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def get(self, key:str):
+        """
+        音声取得
+
+        Args:
+            key (str): 合成結果のキー
+
+        Returns:
+            wave (bytes | None): WAV、存在しない、もしくは破損している場合はNone
+        """
+        digest = self._lookup(key)
+        if digest is None:
+            return None
+        try:
+            with open(self._object_path(key), "rb") as f:
+                wave = f.read()
+        except FileNotFoundError:
+            self._remove(key)
+            return None
+        if self.verify and hashlib.sha256(wave).hexdigest() != digest:
+            self._remove(key)
+            return None
+        return wave
+
+    def copy_to(self, key:str, dest:str) -> bool:
+        """
+        音声をファイルにコピー
+
+        Args:
+            key (str): 合成結果のキー
+            dest (str): コピー先ファイル
+
+        Returns:
+            result (bool): コピーできた場合True
+        """
+        if not self.verify:
+            if self._lookup(key) is None:
+                return False
+            try:
+                shutil.copyfile(self._object_path(key), dest)
+            except FileNotFoundError:
+                self._remove(key)
+                return False
+            return True
+        wave = self.get(key)
+        if wave is None:
+            return False
+        with open(dest, "wb") as f:
+            f.write(wave)
+        return True
+
+    def put(self, key:str, wave:bytes) -> None:
+        """
+        音声登録(同じキーが既にある場合は上書き)
+
+        Args:
+            key (str): 合成結果のキー
+            wave (bytes): WAV
+        """
+        path = self._object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 一時ファイルに書き込んでから置き換え(書きかけのファイルを読ませない)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(wave)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO audio (key, digest, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, hashlib.sha256(wave).hexdigest(), len(wave), now, now)
+            )
+
+    def _remove(self, key:str) -> None:
+        db = self._connect()
+        with db:
+            db.execute("DELETE FROM audio WHERE key = ?", (key,))
+        try:
+            os.remove(self._object_path(key))
+        except FileNotFoundError:
+            pass
+
+    def gc(self, max_bytes:int=None, max_age:float=None) -> int:
+        """
+        古い音声の削除(最終利用が古いものから削除)
+
+        Args:
+            max_bytes (int): 残す合計サイズの上限(省略時は初期化時の値)
+            max_age (float): 残す最終利用からの経過秒数(省略時は初期化時の値)
+
+        Returns:
+            removed (int): 削除した件数
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        db = self._connect()
+        keys = []
+        if max_age is not None:
+            keys += [row[0] for row in db.execute("SELECT key FROM audio WHERE accessed < ?", (time.time() - max_age,))]
+        if max_bytes is not None:
+            total = 0
+            for key, size in db.execute("SELECT key, size FROM audio ORDER BY accessed DESC"):
+                total += size
+                if total > max_bytes:
+                    keys.append(key)
+        for key in set(keys):
+            self._remove(key)
+        return len(set(keys))
+
+    def check(self) -> list:
+        """
+        全件の整合性チェック(索引とファイルが一致しないもの、索引にない古いファイルは削除)
+
+        Returns:
+            broken (list): 削除したキーの一覧
+        """
+        db = self._connect()
+        broken = []
+        for key, digest, size in db.execute("SELECT key, digest, size FROM audio").fetchall():
+            try:
+                with open(self._object_path(key), "rb") as f:
+                    wave = f.read()
+            except FileNotFoundError:
+                broken.append(key)
+                continue
+            if len(wave) != size or hashlib.sha256(wave).hexdigest() != digest:
+                broken.append(key)
+        for key in broken:
+            self._remove(key)
+
+        # 索引にないファイル(登録途中で中断したもの)を削除
+        known = {row[0] for row in db.execute("SELECT key FROM audio")}
+        limit = time.time() - 3600
+        for folder, _, files in os.walk(os.path.join(self.path, "objects")):
+            for name in files:
+                path = os.path.join(folder, name)
+                if name.endswith(".wav") and name[:-4] not in known and os.path.getmtime(path) < limit:
+                    os.remove(path)
+                elif name.endswith(".tmp") and os.path.getmtime(path) < limit:
+                    os.remove(path)
+        return broken
+
+    def stats(self) -> dict:
+        """
+        ストア統計
+
+        Returns:
+            stats (dict): 'entries' 件数, 'bytes' 合計サイズ
+        """
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM audio").fetchone()
+        return {"entries": entries, "bytes": size}
@@ -0,0 +1,130 @@
+import unicodedata
+
+# 区切り文字(優先度の高い順)
+#   句点・感嘆符・疑問符・改行 > 読点・中点 > タブ・空白
+BREAK_LEVELS = (
+    "。．.！？!?\n",
+    "、，,・",
+    "\t 　",
+)
+
+def segment(text:str, limit:int, levels:tuple=BREAK_LEVELS):
+    """
+    テキストを文字数制限以下のチャンクに分割するジェネレーター
+
+    制限内の後半にある区切り文字のうち、最も優先度の高いものの直後で区切る
+    (後半に区切り文字がない場合は、制限内で最も後ろにある区切り文字)
+    区切り文字がない場合は制限の位置で強制的に区切る(結合文字・サロゲートペア・異体字セレクタなどの途中では区切らない)
+
+    Args:
+        text (str): テキスト
+        limit (int): 1チャンクの最大文字数
+        levels (tuple): 区切り文字(優先度の高い順)
+
+    Yields:
+        chunk (str): 分割したテキスト
+    """
+    if limit < 1:
+        raise ValueError("limit must be 1 or more.")
+    length = len(text)
+    start = 0
+    while length - start > limit:
+        end = start + limit
+        # チャンクが短くなりすぎないよう、優先度の高い区切り文字は後半にある場合のみ採用
+        half = start + (limit + 1) // 2
+        cut = -1
+        latest = -1
+        for chars in levels:
+            for char in chars:
+                # 区切り文字の直後で区切る
+                pos = text.rfind(char, start, end) + 1
+                if pos > cut:
+                    cut = pos
+            if cut >= half:
+                break
+            latest = max(latest, cut)
+        else:
+            # 後半に区切り文字がない場合は、最も後ろの区切り文字
+            cut = latest
+        if cut <= start:
+            cut = _safe_cut(text, start, end)
+        yield text[start:cut]
+        start = cut
+    if start < length:
+        yield text[start:]
+
+def _safe_cut(text:str, start:int, end:int) -> int:
+    # 文字の並びを壊さない位置まで区切り位置を戻す(戻せない場合は制限の位置)
+    cut = end
+    while cut > start + 1 and _is_joined(text[cut - 1], text[cut]):
+        cut -= 1
+    return cut if cut > start + 1 or not _is_joined(text[cut - 1], text[cut]) else end
+
+def _is_joined(before:str, after:str) -> bool:
+    # beforeとafterの間で区切ると文字が崩れるか
+    code = ord(after)
+    if 0xDC00 <= code <= 0xDFFF and 0xD800 <= ord(before) <= 0xDBFF:
+        # サロゲートペア
+        return True
+    if before == "\r" and after == "\n":
+        return True
+    if before == "\u200d" or after == "\u200d":
+        # ゼロ幅接合子
+        return True
+    if 0xFE00 <= code <= 0xFE0F or 0xE0100 <= code <= 0xE01EF or 0x1F3FB <= code <= 0x1F3FF:
+        # 異体字セレクタ・絵文字の肌色修飾子
+        return True
+    # 結合文字(濁点・半濁点の結合文字を含む)
+    return unicodedata.category(after)[0] == "M"
+
+class StreamSegmenter:
+    """
+    少しずつ届くテキスト(LLMの出力など)を順次チャンクに分割する
+
+    文の区切り(句点・改行など)が届いた時点、もしくは文字数制限に達した時点でチャンクを返す
+    """
+
+    def __init__(self, limit:int, levels:tuple=BREAK_LEVELS) -> None:
+        """
+        Args:
+            limit (int): 1チャンクの最大文字数
+            levels (tuple): 区切り文字(優先度の高い順、先頭を文の区切りとする)
+        """
+        self.limit = limit
+        self.levels = levels
+        self._buffer = ""
+
+    def feed(self, fragment:str) -> list:
+        """
+        テキストを追加
+
+        Args:
+            fragment (str): 追加するテキスト
+
+        Returns:
+            chunks (list): 確定したチャンクの一覧
+        """
+        self._buffer += fragment
+        chunks = []
+        # 最後の文の区切りまでを確定
+        cut = max(self._buffer.rfind(char) for char in self.levels[0]) + 1
+        if cut > 0:
+            chunks += segment(self._buffer[:cut], self.limit, self.levels)
+            self._buffer = self._buffer[cut:]
+        # 文字数制限を超えた分を確定
+        while len(self._buffer) > self.limit:
+            chunk = next(segment(self._buffer, self.limit, self.levels))
+            chunks.append(chunk)
+            self._buffer = self._buffer[len(chunk):]
+        return chunks
+
+    def flush(self) -> list:
+        """
+        残りのテキストをすべて確定
+
+        Returns:
+            chunks (list): 確定したチャンクの一覧
+        """
+        chunks = list(segment(self._buffer, self.limit, self.levels))
+        self._buffer = ""
+        return chunks
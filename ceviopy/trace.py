@@ -0,0 +1,353 @@
+import functools
+import gzip
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from .apartment import com_apartment
+from .audio import speed_rate
+from .backend import Backend, play_wave
+from .liveness import com_hresult
+from .profile import Profile
+from .proxy import PLAIN_TYPES, ComProxy, dispatch_label
+from .simulator import Simulator
+
+# トレースの形式(1行1件のJSON配列、先頭行はヘッダー)
+#   COM呼び出し : [種別, 開始時刻, スレッド, オブジェクト, メンバー, 引数, 戻り値, 秒数]
+#                 種別 "d":Dispatch "g":プロパティ取得 "s":プロパティ設定 "c":メソッド呼び出し
+#                 戻り値がCOMオブジェクトの場合は {"$": オブジェクト番号}、例外の場合は {"!": 内容, "hresult": HRESULT}
+#   Cevioの呼び出し : ["m", 開始時刻, スレッド, メソッド名, 引数, キーワード引数, 秒数, 例外]
+TRACE_VERSION = 1
+
+# 記録するCevioの公開メソッド(他のメソッドから呼ばれた場合は記録しない)
+# read_jsonはファイルに依存するため、内部で呼び出すset_cast等を記録する
+# activateのProfileは設定辞書として記録する(ファイルのパスはそのまま記録)
+# overrideはwithブロックの範囲を再現できないため記録しない(ブロック内の呼び出しは変更後の設定のまま記録される)
+TRACED_METHODS = (
+    "speak", "speak_as", "set_cast", "set_talk_param", "set_talk_params", "set_cast_param", "set_cast_params",
+    "apply", "activate", "read_dict", "render_batch", "render_script", "invalidate", "refresh_catalog"
+)
+
+# 戻り値のCOMオブジェクトの種類(取得元のメンバー: 種類)、Simulatorのメンバー名と揃える
+_RETURN_TYPES = {
+    "Talker.Components": "Components",
+    "Talker.AvailableCasts": "StringArray",
+    "Talker.Speak": "SpeakingState",
+    "Components.At": "Component",
+    "Components.ByName": "Component",
+}
+
+# 処理時間がテキストに依存するメンバー(再生時は記録した時間ではなく、推定した合成・再生速度で模擬)
+_WORK_MEMBERS = ("SpeakingState.Wait", "SpeakingState.Wait_2", "Talker.OutputWaveToFile")
+
+class TraceWriter:
+    """
+    COMセッションの記録
+    Cevioがtalk・controlに対して行う呼び出しを、引数・戻り値・時間とともにファイルへ書き出す
+    Cevio(trace="session.trace.gz")の場合に利用する
+    """
+
+    def __init__(self, path:str, mode:str=None) -> None:
+        """
+        Args:
+            path (str): 記録先(.gzの場合は圧縮)
+            mode (str): CeVIOの種類(ヘッダーに記録)
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._objects = 0
+        self._threads = {}
+        self._local = threading.local()
+        self._write({"version": TRACE_VERSION, "mode": mode, "started": time.time()})
+
+    def wrap(self, backend):
+        """
+        記録するバックエンド
+        """
+        return TracingBackend(backend, self)
+
+    def attach(self, cevio) -> None:
+        """
+        Cevioの公開メソッドの呼び出しを記録する(TRACED_METHODS)
+        """
+        for name in TRACED_METHODS:
+            setattr(cevio, name, self._traced(name, getattr(cevio, name)))
+
+    def close(self) -> None:
+        """
+        記録を終了
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _traced(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            depth = getattr(self._local, "depth", 0)
+            if depth:
+                return method(*args, **kwargs)
+            self._local.depth = 1
+            start = time.perf_counter()
+            error = None
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                error = repr(e)
+                raise
+            finally:
+                self._local.depth = 0
+                self._write(["m", self._offset(start), self._thread(), name, [_encode(arg) for arg in args], kwargs, round(time.perf_counter() - start, 6), error])
+        return wrapper
+
+    def _new_object(self) -> int:
+        with self._lock:
+            self._objects += 1
+            return self._objects
+
+    def _thread(self) -> int:
+        ident = threading.get_ident()
+        thread = self._threads.get(ident)
+        if thread is None:
+            with self._lock:
+                thread = self._threads.setdefault(ident, len(self._threads))
+        return thread
+
+    def _offset(self, start:float) -> float:
+        return round(start - self._start, 6)
+
+    def _record(self, kind:str, start:float, oid:int, member:str, args, result, seconds:float) -> None:
+        self._write([kind, self._offset(start), self._thread(), oid, member, args, result, round(seconds, 6)])
+
+    def _write(self, entry) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=repr)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+def _encode(arg):
+    # Cevioの呼び出しの引数を記録用に変換(Profileは設定辞書に戻す)
+    if isinstance(arg, Profile):
+        return {"Cast": arg.cast, "talk": dict(arg.talk), "Emotion": dict(arg.emotion)}
+    return arg
+
+class TracingBackend(Backend):
+    """
+    COM呼び出しを記録するバックエンド(TraceWriter.wrap)
+    """
+
+    def __init__(self, backend, writer:TraceWriter) -> None:
+        self.backend = backend
+        self.writer = writer
+
+    def Dispatch(self, progid:str):
+        start = time.perf_counter()
+        obj = self.backend.Dispatch(progid)
+        oid = self.writer._new_object()
+        self.writer._record("d", start, oid, progid, [], None, time.perf_counter() - start)
+        return ComProxy(obj, dispatch_label(progid), self, oid)
+
+    def apartment(self):
+        return com_apartment(self.backend)
+
+    def play(self, wave:bytes) -> None:
+        getattr(self.backend, "play", play_wave)(wave)
+
+    def observe(self, kind:str, proxy, member:str, args, start:float, value=None, error=None):
+        # ComProxyからの通知(呼び出しを記録し、戻り値のCOMオブジェクトは番号を振って包む)
+        seconds = time.perf_counter() - start
+        if (error is not None):
+            result = {"!": repr(error), "hresult": com_hresult(error)}
+        elif (kind == "s" or isinstance(value, PLAIN_TYPES)):
+            result = value
+        else:
+            oid = self.writer._new_object()
+            value, result = ComProxy(value, _RETURN_TYPES.get(member, member), self, oid), {"$": oid}
+        self.writer._record(kind, start, proxy._oid, member, list(args), result, seconds)
+        return value
+
+class TraceReplayer:
+    """
+    記録したCOMセッションの再生
+    記録した呼び出し時間で動作するSimulatorを作成し、記録したCevioの呼び出しを同じ間隔で再実行する
+    変更後のコード(スケジューリング・キャッシュ等)を、実機の時間で比較する
+
+    Examples:
+        replayer = TraceReplayer("session.trace.gz")
+        sim = replayer.backend()
+        cevio = Cevio(replayer.mode, backend=sim)
+        replayer.replay(cevio)
+        ## > {'speak': {'count': 12, 'recorded': 8.1, 'replayed': 6.4}, ...}
+    """
+
+    def __init__(self, path:str) -> None:
+        """
+        Args:
+            path (str): 記録したファイル(.gzの場合は圧縮)
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            lines = iter(f)
+            self.header = json.loads(next(lines))
+            entries = [json.loads(line) for line in lines if line.strip()]
+        if self.header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {self.header.get('version')}.")
+        self.mode = self.header.get("mode") or "AI"
+        self.calls = [entry for entry in entries if entry[0] != "m"]
+        self.methods = sorted((entry for entry in entries if entry[0] == "m"), key=lambda entry: entry[1])
+
+    def latencies(self) -> dict:
+        """
+        メンバーごとの呼び出し時間(秒)の一覧(記録順)
+        テキストに依存するメンバー(Wait, OutputWaveToFile)とDispatchは含まない
+        """
+        result = {}
+        for kind, _, _, _, member, _, _, seconds in self.calls:
+            if kind != "d" and member not in _WORK_MEMBERS:
+                result.setdefault(member, []).append(seconds)
+        return result
+
+    def profile(self) -> dict:
+        """
+        メンバーごとの呼び出し時間の要約
+
+        Returns:
+            profile (dict): {メンバー: {'count', 'mean', 'p50', 'p95', 'max'}}
+        """
+        result = {}
+        for member, samples in self.latencies().items():
+            ordered = sorted(samples)
+            result[member] = {
+                "count": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max": ordered[-1]
+            }
+        return result
+
+    def calibrate(self) -> dict:
+        """
+        記録から音声合成・再生の速さを推定
+
+        Returns:
+            params (dict): Simulatorの引数 'synthesis_rate', 'chars_per_second'(推定できないものは含まない)
+        """
+        synthesis = []
+        playback = []
+        speeds = {}
+        spoken = {}
+        for kind, start, _, oid, member, args, result, seconds in self.calls:
+            if member == "Talker.Speed" and kind in ("g", "s"):
+                speeds[oid] = args[0] if kind == "s" else result
+            elif member == "Talker.OutputWaveToFile" and result is True and args and args[0]:
+                synthesis.append(seconds / len(args[0]))
+            elif member == "Talker.Speak" and isinstance(result, dict) and args and args[0]:
+                spoken[result.get("$")] = (start, args[0], speeds.get(oid, 50))
+            elif member == "SpeakingState.Wait" and oid in spoken:
+                speak_start, text, speed = spoken.pop(oid)
+                playback.append((start + seconds - speak_start, text, speed))
+        params = {}
+        rate = statistics.median(synthesis) if synthesis else None
+        if rate is not None:
+            params["synthesis_rate"] = rate
+        samples = []
+        for total, text, speed in playback:
+            seconds = total - (rate or 0.0) * len(text)
+            if seconds > 0:
+                samples.append(len(text) / (seconds * speed_rate(speed)))
+        if samples:
+            params["chars_per_second"] = statistics.median(samples)
+        return params
+
+    def backend(self, **kwargs) -> "ReplaySimulator":
+        """
+        記録した呼び出し時間・推定した合成/再生の速さで動作するSimulator
+
+        Args:
+            **kwargs: Simulatorの引数(推定値より優先)
+        """
+        casts = kwargs.pop("casts", None) or self._casts()
+        return ReplaySimulator(self.latencies(), casts=casts, **dict(self.calibrate(), **kwargs))
+
+    def replay(self, cevio, realtime:bool=True, out_dir:str=None) -> dict:
+        """
+        記録したCevioの呼び出しを再実行
+
+        Args:
+            cevio (Cevio): 再実行に使うCevio(通常はbackend()を渡したもの)
+            realtime (bool): 記録した呼び出しの間隔を再現する(Falseの場合は間隔を空けずに実行)
+            out_dir (str): render_batch・render_scriptの出力先(省略時は一時フォルダ)
+
+        Returns:
+            summary (dict): {メソッド名: {'count' 回数, 'recorded' 記録した合計秒数, 'replayed' 再実行の合計秒数, 'errors' 例外の数}}
+        """
+        summary = {}
+        start = time.perf_counter()
+        first = self.methods[0][1] if self.methods else 0.0
+        with tempfile.TemporaryDirectory(prefix="ceviopy-replay-") as work:
+            for index, (_, offset, _, name, args, kwargs, seconds, _) in enumerate(self.methods):
+                if realtime:
+                    time.sleep(max(offset - first - (time.perf_counter() - start), 0))
+                if name == "render_batch":
+                    args = [args[0], out_dir or os.path.join(work, str(index))] + args[2:]
+                elif name == "render_script":
+                    args = [args[0], os.path.join(out_dir or work, f"script-{index}.wav")] + args[2:]
+                entry = summary.setdefault(name, {"count": 0, "recorded": 0.0, "replayed": 0.0, "errors": 0})
+                began = time.perf_counter()
+                try:
+                    getattr(cevio, name)(*args, **kwargs)
+                except Exception:
+                    entry["errors"] += 1
+                entry["count"] += 1
+                entry["recorded"] += seconds
+                entry["replayed"] += time.perf_counter() - began
+        return summary
+
+    def _casts(self):
+        # 記録したキャスト・感情パラメータの初期値(記録にない場合はSimulatorの既定値)
+        casts = {}
+        components = {}
+        current = {}
+        for kind, _, _, oid, member, args, result, _ in self.calls:
+            if member == "StringArray.At" and isinstance(result, str):
+                casts.setdefault(result, {})
+            elif member == "Talker.Cast":
+                current["Cast"] = args[0] if kind == "s" else result
+            elif member == "Talker.Components":
+                current["components"] = result.get("$") if isinstance(result, dict) else None
+            elif member in ("Components.At", "Components.ByName") and isinstance(result, dict):
+                components[result.get("$")] = {"Cast": current.get("Cast")}
+            elif member == "Component.Name" and oid in components:
+                components[oid]["Name"] = result
+            elif member == "Component.Value" and kind == "g" and oid in components:
+                item = components[oid]
+                if item.get("Cast") in casts and "Name" in item:
+                    casts[item["Cast"]].setdefault(item["Name"], result)
+        return {name: values for name, values in casts.items() if values} or None
+
+class ReplaySimulator(Simulator):
+    """
+    記録した呼び出し時間で動作するSimulator(TraceReplayer.backend)
+    メンバーごとに記録した時間を順に使い(使い切ったら先頭から)、記録にないメンバーはcall_latency
+    """
+
+    def __init__(self, latencies:dict, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._latencies = latencies
+        self._positions = {}
+
+    def call(self, member:str) -> None:
+        samples = self._latencies.get(member)
+        if not samples:
+            super().call(member)
+            return
+        with self._lock:
+            self.calls[member] += 1
+            position = self._positions.get(member, 0)
+            self._positions[member] = position + 1
+        time.sleep(samples[position % len(samples)])
@@ -1,4 +1,3 @@
-from win32com import client
 import json
 import re
 
@@ -37,7 +36,8 @@ class Cevio:
         else:
             raise CevioException("mode must be 'AI' or 'CCS'.")
 
-        # APIオブジェクト生成
+        # APIオブジェクト生成(pywin32はインポート時ではなく生成時に読み込む)
+        from win32com import client
         self.talk = client.Dispatch(self._params["talk_module"])
         self.control = client.Dispatch(self._params["control_module"])
 
@@ -1,15 +1,28 @@
-from win32com import client
 import json
 import re
 
+class _Dispatch:
+    """
+    COMオブジェクトを初回参照時に生成(インポート時にはCOMを起動しない)
+    """
+    def __init__(self, progid):
+        self._progid = progid
+        self._object = None
+
+    def __get__(self, instance, owner):
+        if self._object is None:
+            from win32com import client
+            self._object = client.Dispatch(self._progid)
+        return self._object
+
 class Cevio:
     """
     CeVIO Creative Studio 外部連携API
     CeVIO Component Object Model -> Python
     """
     # API設定
-    talk = client.Dispatch("CeVIO.Talk.RemoteService.TalkerV40")
-    control = client.Dispatch("CeVIO.Talk.RemoteService.ServiceControlV40")
+    talk = _Dispatch("CeVIO.Talk.RemoteService.TalkerV40")
+    control = _Dispatch("CeVIO.Talk.RemoteService.ServiceControlV40")
     def __init__(self):
         # start CeVIO CCS
         self.start_cevio()
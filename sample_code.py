@@ -6,7 +6,7 @@ def main():
     サンプルテキスト
     cevio.pyをそのまま実行するとサンプルテキストを再生します(さとうささらボイスのみ対応)
     """
-    t = Cevio(mode="AI")
+    t = Cevio(mode="AI", verbose=True)
     # さとうささらのトークを利用されている方のみ、次行のサンプルを利用可能です。
     # t.make_speech_mode()
     print(t.get_talk_params())
@@ -0,0 +1,115 @@
+import time
+import pytest
+from ceviopy.admission import ChatReader
+
+# chars_per_second=10、Speed=50 の見積もりは10文字で1秒
+def _reader(**kwargs):
+    kwargs.setdefault("chars_per_second", 10.0)
+    return ChatReader(**kwargs)
+
+def _drain(reader):
+    # 読み上げ待ちのメッセージをすべて取り出す
+    texts = []
+    while True:
+        item = reader.next(timeout=0)
+        if (item is None):
+            return texts
+        texts.append(item.text)
+
+def _balanced(stats):
+    # 受信したメッセージは、追加・破棄・結合・置き換えのいずれか1つに数える
+    return stats["offered"] == stats["admitted"] + stats["dropped"] + stats["merged"] + stats["replaced"]
+
+def test_estimate_follows_speed():
+    reader = _reader()
+    assert reader.estimate("あ" * 10) == pytest.approx(1.0)
+    reader.speed = 100
+    assert reader.estimate("あ" * 10) == pytest.approx(0.5)
+    reader.speed = 0
+    assert reader.estimate("あ" * 10) == pytest.approx(2.0)
+
+def test_latest_wins_drops_oldest():
+    reader = _reader(max_lag=3.5, truncate=False, fair=False)
+    texts = [char * 10 for char in "あいうえ"]
+    assert all(reader.offer(text) for text in texts)
+    assert _drain(reader) == texts[1:]
+    stats = reader.stats()
+    assert (stats["offered"], stats["admitted"], stats["dropped"]) == (4, 3, 1)
+    assert _balanced(stats)
+
+def test_oldest_wins_drops_newest():
+    reader = _reader(max_lag=3.5, truncate=False, fair=False, latest_wins=False)
+    texts = [char * 10 for char in "あいうえ"]
+    assert [reader.offer(text) for text in texts] == [True, True, True, False]
+    assert _drain(reader) == texts[:3]
+    stats = reader.stats()
+    assert (stats["offered"], stats["admitted"], stats["dropped"]) == (4, 3, 1)
+    assert _balanced(stats)
+
+def test_truncate_to_budget():
+    reader = _reader(max_lag=2.0, latest_wins=False, min_chars=5)
+    assert reader.offer("あいうえおかきくけこ。" * 3)
+    assert _drain(reader) == ["あいうえおかきくけこ。"]
+    stats = reader.stats()
+    assert (stats["admitted"], stats["truncated"]) == (1, 1)
+
+def test_truncate_below_min_chars_drops():
+    reader = _reader(max_lag=2.0, latest_wins=False, min_chars=5)
+    assert reader.offer("あ" * 18)
+    # 残り0.2秒(2文字)はmin_chars未満
+    assert not reader.offer("い" * 10)
+    stats = reader.stats()
+    assert (stats["admitted"], stats["dropped"], stats["truncated"]) == (1, 1, 0)
+
+def test_per_user_latest_replaces():
+    reader = _reader(per_user="latest")
+    reader.offer("一つ目", user="a")
+    reader.offer("二つ目", user="a")
+    reader.offer("別の人", user="b")
+    assert _drain(reader) == ["二つ目", "別の人"]
+    stats = reader.stats()
+    assert (stats["offered"], stats["admitted"], stats["replaced"]) == (3, 2, 1)
+    assert _balanced(stats)
+
+def test_per_user_merge_keeps_first_arrival():
+    reader = _reader(per_user="merge")
+    reader.offer("一つ目", user="a")
+    first = reader._queues["a"][0].arrival
+    reader.offer("二つ目", user="a")
+    item = reader.next(timeout=0)
+    assert item.text == "一つ目\n二つ目"
+    assert item.arrival == first
+    stats = reader.stats()
+    assert (stats["offered"], stats["admitted"], stats["merged"]) == (2, 1, 1)
+    assert _balanced(stats)
+
+def test_fair_round_robin():
+    reader = _reader(fair=True)
+    reader.offer("a1", user="a")
+    reader.offer("a2", user="a")
+    reader.offer("b1", user="b")
+    assert _drain(reader) == ["a1", "b1", "a2"]
+
+def test_arrival_order_without_fair():
+    reader = _reader(fair=False)
+    reader.offer("a1", user="a")
+    reader.offer("a2", user="a")
+    reader.offer("b1", user="b")
+    assert _drain(reader) == ["a1", "a2", "b1"]
+
+def test_expired_at_dispatch():
+    reader = _reader(max_lag=0.3, truncate=False)
+    assert reader.offer("あい")
+    time.sleep(0.2)
+    # 残り0.1秒に0.2秒のメッセージは収まらない
+    assert reader.next(timeout=0) is None
+    stats = reader.stats()
+    assert (stats["admitted"], stats["expired"]) == (1, 1)
+
+def test_closed_reader_rejects():
+    reader = _reader()
+    reader.offer("あ")
+    reader.close()
+    assert not reader.offer("い")
+    assert reader.next() is None
+    assert reader.stats()["offered"] == 1
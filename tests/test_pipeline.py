@@ -0,0 +1,45 @@
+import pytest
+from ceviopy.cevio import Cevio
+from ceviopy.events import CHUNK_STARTED
+from ceviopy.simulator import Simulator
+
+# 複数チャンクに分割される長さのセリフ(1文約55文字 × 30文、200文字ごとに約9チャンク)
+TEXT = "本日はご来店いただき、誠にありがとうございます。ただいまタイムセールを実施しておりますので、ぜひご利用ください。" * 30
+
+def _cevio(**kwargs):
+    sim = Simulator(synthesis_rate=0.0, chars_per_second=100000.0)
+    return Cevio("AI", backend=sim, **kwargs), sim
+
+def test_pipelined_chunks_play_in_order():
+    played = []
+    cevio, sim = _cevio(player=played.append)
+    started = []
+    cevio.events.subscribe(CHUNK_STARTED, started.append)
+
+    cevio.speak(TEXT, pipeline_depth=2)
+    cevio.events.flush()
+
+    chunks = [speech for speech in cevio._text_split(TEXT, 200) if speech != ""]
+    assert len(chunks) > 2
+    assert [event.index for event in started] == list(range(len(chunks)))
+    assert [event.text for event in started] == chunks
+    assert len(played) == len(chunks)
+    assert sim.calls["Talker.OutputWaveToFile"] == len(chunks)
+    cevio.close()
+
+def test_player_error_propagates_and_stops_rendering():
+    played = []
+
+    def player(wave):
+        played.append(wave)
+        if (len(played) == 2):
+            raise RuntimeError("device lost")
+
+    cevio, sim = _cevio(player=player)
+    with pytest.raises(RuntimeError, match="device lost"):
+        cevio.speak(TEXT, pipeline_depth=1)
+    chunks = [speech for speech in cevio._text_split(TEXT, 200) if speech != ""]
+    assert len(played) == 2
+    # 再生エラー後は残りを合成しない(先行合成分のみ)
+    assert sim.calls["Talker.OutputWaveToFile"] < len(chunks)
+    cevio.close()
@@ -0,0 +1,17 @@
+from ceviopy.cevio import Cevio
+from ceviopy.simulator import Simulator
+from ceviopy.trace import TraceReplayer
+
+def test_instrument_and_trace_together(tmp_path):
+    path = str(tmp_path / "session.trace")
+    cevio = Cevio("AI", backend=Simulator(synthesis_rate=0.0, chars_per_second=100000.0), instrument=True, trace=path)
+    cevio.set_talk_param("Speed", 60)
+    cevio.speak("こんにちは")
+    stats = cevio.stats()
+    cevio.close()
+
+    assert "Talker.Speak()" in stats["methods"]["Cevio.speak"]["members"]
+    assert "Talker.Speed=" in stats["methods"]["Cevio.set_talk_param"]["members"]
+    replayer = TraceReplayer(path)
+    assert [entry[3] for entry in replayer.methods] == ["set_talk_param", "speak"]
+    assert any(entry[4] == "Talker.Speak" for entry in replayer.calls)
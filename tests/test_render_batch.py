@@ -0,0 +1,55 @@
+import json
+import os
+from ceviopy.cevio import Cevio
+from ceviopy.simulator import Simulator
+
+def _cevio(**kwargs):
+    sim = Simulator(synthesis_rate=0.0, chars_per_second=100000.0)
+    return Cevio("AI", backend=sim, **kwargs), sim
+
+def test_render_batch_resumes_from_manifest(tmp_path):
+    cevio, sim = _cevio()
+    items = [
+        {"text": "いらっしゃいませ", "name": "a.wav"},
+        {"text": "ありがとうございました", "Emotion": {"元気": 80}, "name": "b.wav"},
+        {"text": "またお越しください", "name": "c.wav"},
+    ]
+    out = str(tmp_path)
+
+    result = cevio.render_batch(items, out)
+    assert (result["rendered"], result["skipped"]) == (3, 0)
+    assert all(os.path.exists(os.path.join(out, item["name"])) for item in items)
+
+    # 出力済みは省略
+    result = cevio.render_batch(items, out)
+    assert (result["rendered"], result["skipped"]) == (0, 3)
+
+    # ファイルが消えたもの、内容が変わったものだけを出力し直す(中断時の書きかけの行は無視)
+    os.remove(os.path.join(out, "a.wav"))
+    with open(os.path.join(out, "manifest.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"file": "c.wav", "ke')
+    items[2] = dict(items[2], text="またのお越しをお待ちしております")
+    result = cevio.render_batch(items, out)
+    assert (result["rendered"], result["skipped"]) == (2, 1)
+
+    # 書きかけの行の後も、次の記録は別の行に書き込む
+    result = cevio.render_batch(items, out)
+    assert (result["rendered"], result["skipped"]) == (0, 3)
+    with open(os.path.join(out, "manifest.jsonl"), "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[-3] == '{"file": "c.wav", "ke'
+    assert {json.loads(line)["file"] for line in lines[-2:]} == {"a.wav", "c.wav"}
+    cevio.close()
+
+def test_render_batch_resets_unspecified_emotions(tmp_path):
+    cevio, sim = _cevio(instrument=True)
+    items = [
+        {"text": "元気に", "Emotion": {"元気": 80}, "name": "a.wav"},
+        {"text": "怒って", "Emotion": {"怒り": 50}, "name": "b.wav"},
+    ]
+    cevio.stats(reset=True)
+    cevio.render_batch(items, str(tmp_path))
+    members = cevio.stats()["methods"]["Cevio.render_batch"]["members"]
+    # 元気=80、怒り=50の設定と、次のセリフで指定のない元気の初期値への戻し
+    assert members["Talker.Components.ByName().Value="]["count"] == 3
+    cevio.close()
@@ -0,0 +1,88 @@
+import threading
+import pytest
+from ceviopy.cevio import CevioException
+from ceviopy.events import CHUNK_STARTED
+from ceviopy.scheduler import AMBIENT, URGENT, SpeechScheduler
+from ceviopy.simulator import Simulator
+
+# 複数チャンクに分割される長さのセリフ(1チャンク約0.2秒)
+AMBIENT_TEXT = ("いらっしゃいませ。本日はタイムセールを実施しております。お買い得な商品を多数ご用意しておりますので、ぜひご利用ください。" * 12)
+URGENT_TEXT = "地震です。"
+
+def _scheduler():
+    scheduler = SpeechScheduler("AI", backend=Simulator(synthesis_rate=0.0, chars_per_second=1000.0))
+    started = []
+    cond = threading.Condition()
+
+    def on_started(event):
+        with cond:
+            started.append((event.text == URGENT_TEXT, event.index))
+            cond.notify_all()
+
+    def wait_for(key):
+        # 指定したチャンクの再生開始を待つ
+        with cond:
+            assert cond.wait_for(lambda: key in started, 5)
+
+    scheduler.events.subscribe(CHUNK_STARTED, on_started)
+    return scheduler, started, wait_for
+
+def test_urgent_preempts_ambient_and_ambient_resumes():
+    scheduler, started, wait_for = _scheduler()
+    ambient = scheduler.submit(AMBIENT_TEXT, priority=AMBIENT)
+    wait_for((False, 1))
+    urgent = scheduler.submit(URGENT_TEXT, priority=URGENT)
+    assert urgent.wait(5) and ambient.wait(5)
+    scheduler.close()
+
+    assert (ambient.status, urgent.status) == ("done", "done")
+    chunks = len(ambient._chunks)
+    assert chunks > 2
+    # 中断したチャンク(1)から再開する
+    assert started == [(False, 0), (False, 1), (True, 0)] + [(False, index) for index in range(1, chunks)]
+    metrics = scheduler.metrics()
+    assert (metrics["spoken"], metrics["preempted"], metrics["cancelled"]) == (2, 1, 0)
+    assert metrics["preemption_latency"]["count"] == 1
+    assert metrics["queue_wait"]["count"] == 2
+
+def test_cancel_queued_and_speaking():
+    scheduler, started, wait_for = _scheduler()
+    speaking = scheduler.submit(AMBIENT_TEXT)
+    queued = scheduler.submit(AMBIENT_TEXT)
+    wait_for((False, 0))
+
+    assert queued.cancel()
+    assert queued.status == "cancelled" and queued.wait(0)
+    assert speaking.cancel()
+    assert speaking.wait(5) and speaking.status == "cancelled"
+    assert not speaking.cancel()
+    scheduler.close()
+
+    assert started == [(False, 0)]
+    assert scheduler.pending() == 0
+    metrics = scheduler.metrics()
+    assert (metrics["spoken"], metrics["cancelled"]) == (0, 2)
+
+def test_close_with_cancel():
+    scheduler, started, wait_for = _scheduler()
+    speaking = scheduler.submit(AMBIENT_TEXT)
+    queued = scheduler.submit(URGENT_TEXT, priority=AMBIENT)
+    wait_for((False, 0))
+    scheduler.close(cancel=True)
+
+    assert (speaking.status, queued.status) == ("cancelled", "cancelled")
+    assert speaking.wait(0) and queued.wait(0)
+    assert started == [(False, 0)]
+    assert scheduler.metrics()["cancelled"] == 2
+    with pytest.raises(CevioException):
+        scheduler.submit(URGENT_TEXT)
+
+def test_close_plays_remaining():
+    scheduler, started, wait_for = _scheduler()
+    handles = [scheduler.submit(URGENT_TEXT) for _ in range(3)]
+    scheduler.close()
+
+    assert [handle.status for handle in handles] == ["done"] * 3
+    metrics = scheduler.metrics()
+    assert (metrics["spoken"], metrics["cancelled"], metrics["preempted"]) == (3, 0, 0)
+    assert metrics["queue_wait"]["count"] == 3
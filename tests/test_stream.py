@@ -0,0 +1,60 @@
+import asyncio
+import time
+import pytest
+from ceviopy.aio import AsyncCevio
+from ceviopy.cevio import Cevio
+from ceviopy.simulator import Simulator
+
+def _fragments(sim, spoken):
+    # 2つ目のチャンクは、最初のチャンクの再生中に確定し、次の断片が届く前に再生される
+    yield "あいう。"
+    time.sleep(0.2)
+    yield "えお。"
+    time.sleep(1.0)
+    spoken.append(sim.calls["Talker.Speak"])
+    yield "か"
+
+def test_speak_stream_plays_pending_chunk_while_waiting():
+    sim = Simulator(chars_per_second=20, call_latency=0.003)
+    cevio = Cevio("AI", backend=sim)
+    spoken = []
+    report = cevio.speak_stream(_fragments(sim, spoken))
+    assert spoken == [2]
+    assert report["chunks"] == 3
+    cevio.close()
+
+def test_speak_stream_async_plays_pending_chunk_while_waiting():
+    sim = Simulator(chars_per_second=20, call_latency=0.003)
+    cevio = Cevio("AI", backend=sim)
+    spoken = []
+
+    async def fragments():
+        yield "あいう。"
+        await asyncio.sleep(0.2)
+        yield "えお。"
+        await asyncio.sleep(1.0)
+        spoken.append(sim.calls["Talker.Speak"])
+        yield "か"
+
+    report = asyncio.run(cevio.speak_stream(fragments()))
+    assert spoken == [2]
+    assert report["chunks"] == 3
+    cevio.close()
+
+def test_async_cevio_speak_stream_waits_for_speech_on_source_error():
+    sim = Simulator(synthesis_rate=0.0, chars_per_second=100.0)
+
+    async def fragments():
+        yield "あいうえお。"
+        await asyncio.sleep(0)
+        raise ValueError("source lost")
+
+    async def main():
+        async with AsyncCevio("AI", backend=sim) as talk:
+            with pytest.raises(ValueError, match="source lost"):
+                await talk.speak_stream(fragments())
+            # 受け取り済みの断片は再生済みで、再生のタスクは残っていない
+            assert sim.calls["Talker.Speak"] == 1
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(main())
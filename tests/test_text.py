@@ -0,0 +1,74 @@
+import random
+import pytest
+from ceviopy.text import BREAK_LEVELS, StreamSegmenter, _is_joined, segment
+
+SAMPLES = [
+    "本日はご来店いただき、誠にありがとうございます。ただいまタイムセールを実施しております！ぜひご利用ください？" * 5,
+    "区切り文字のない長いテキスト" * 20,
+    "Hello, world. This is a test of the segmenter, with spaces and commas.\nNext line" * 4,
+    # サロゲートペア・結合文字・ゼロ幅接合子・異体字セレクタ
+    "😀がき゚👨‍👩‍👧☺️👍\U0001F3FD" * 30,
+    # COMから受け取った文字列など、サロゲートペアのままのテキスト
+    "あ\ud83d\ude00" * 50,
+]
+
+def _boundaries(chunks):
+    # チャンクの境界の前後の文字
+    return [(before[-1], after[0]) for before, after in zip(chunks, chunks[1:])]
+
+@pytest.mark.parametrize("limit", [1, 2, 7, 50, 200])
+@pytest.mark.parametrize("text", SAMPLES)
+def test_segment_rejoins_within_limit(text, limit):
+    chunks = list(segment(text, limit))
+    assert "".join(chunks) == text
+    assert all(1 <= len(chunk) <= limit for chunk in chunks)
+
+# 最も長い文字の並び(👨‍👩‍👧、5文字)より長い制限
+@pytest.mark.parametrize("limit", [6, 7, 50])
+@pytest.mark.parametrize("text", SAMPLES[3:])
+def test_segment_keeps_joined_characters(text, limit):
+    chunks = list(segment(text, limit))
+    assert "".join(chunks) == text
+    assert not any(_is_joined(before, after) for before, after in _boundaries(chunks))
+
+def test_segment_prefers_comma_to_space():
+    # 後半に読点と空白がある場合は、後ろにある空白より読点を優先
+    assert list(segment("あいうえお、かき くけこさしす", 10)) == ["あいうえお、", "かき くけこさしす"]
+    # 後半に区切り文字がない場合は、前半の最も後ろの区切り文字
+    assert list(segment("あ。い、うえおかきくけこ", 10)) == ["あ。い、", "うえおかきくけこ"]
+
+def test_segment_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        list(segment("あ", 0))
+
+def _sentences(text):
+    # 文の区切りの直後で分割
+    sentences, start = [], 0
+    for pos, char in enumerate(text):
+        if char in BREAK_LEVELS[0]:
+            sentences.append(text[start:pos + 1])
+            start = pos + 1
+    return sentences + [text[start:]] if start < len(text) else sentences
+
+@pytest.mark.parametrize("limit", [7, 50, 200])
+@pytest.mark.parametrize("text", SAMPLES)
+def test_stream_matches_segment(text, limit):
+    # 1文字ずつ届く場合は、文ごとにsegmentした結果と一致する
+    segmenter = StreamSegmenter(limit)
+    chunks = [chunk for char in text for chunk in segmenter.feed(char)] + segmenter.flush()
+    assert chunks == [chunk for sentence in _sentences(text) for chunk in segment(sentence, limit)]
+
+@pytest.mark.parametrize("limit", [7, 50, 200])
+@pytest.mark.parametrize("text", SAMPLES)
+def test_stream_rejoins_within_limit(text, limit):
+    rand = random.Random(limit)
+    segmenter = StreamSegmenter(limit)
+    chunks, pos = [], 0
+    while pos < len(text):
+        size = rand.randint(1, 30)
+        chunks += segmenter.feed(text[pos:pos + size])
+        pos += size
+    chunks += segmenter.flush()
+    assert "".join(chunks) == text
+    assert all(1 <= len(chunk) <= limit for chunk in chunks)
+    assert segmenter.flush() == []